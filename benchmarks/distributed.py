@@ -0,0 +1,180 @@
+"""Run distributed renaming with several local worker processes.
+
+Starts the stand-in model server from ``benchmarks.inference_backends``
+(one slot per worker, like one GPU per host), publishes a directory of
+fake images, and runs worker processes against the shared queue. One
+worker is killed partway through so its leased job has to expire and be
+reassigned. Afterwards every image must have been renamed exactly once.
+
+Usage:
+    python -m benchmarks.distributed --images 60 --workers 3
+    python -m benchmarks.distributed --images 60 --workers 3 --tcp
+"""
+
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.inference_backends import StandInServer
+from models.distributed import Coordinator
+from utils.job_queue import JobQueue, JobQueueServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_directory(count):
+    """Create a temporary directory of distinct fake PNG files.
+
+    Args:
+        count: Number of files
+
+    Returns:
+        str: Path to the directory
+    """
+    directory = tempfile.mkdtemp(prefix="distributed_bench_")
+    for i in range(count):
+        with open(os.path.join(directory, f"IMG_{i:05d}.png"), "wb") as image_file:
+            image_file.write(b"\x89PNG\r\n\x1a\n" + os.urandom(4096))
+    return directory
+
+
+def start_worker(queue_location, host, worker_id, lease_seconds):
+    """Start a worker process.
+
+    Args:
+        queue_location: Queue path or ``tcp://`` address
+        host: Inference endpoint
+        worker_id: Identifier for the worker
+        lease_seconds: Lease length
+
+    Returns:
+        subprocess.Popen: The worker process
+    """
+    return subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(REPO_ROOT, "distributed_rename.py"),
+            "worker",
+            "--queue",
+            queue_location,
+            "--host",
+            host,
+            "--worker-id",
+            worker_id,
+            "--lease-seconds",
+            str(lease_seconds),
+            "--exit-when-idle",
+        ],
+        cwd=REPO_ROOT,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def run(images, workers, use_tcp, lease_seconds, kill_after, prefill):
+    """Run one distributed batch and verify the result.
+
+    Args:
+        images: Number of images
+        workers: Number of worker processes
+        use_tcp: Reach the queue through JobQueueServer instead of SQLite
+        lease_seconds: Lease length for workers
+        kill_after: Seconds before one worker is killed, or None
+        prefill: Seconds the stand-in server spends per request
+
+    Returns:
+        dict: Elapsed seconds and the coordinator's counts
+    """
+    directory = make_directory(images)
+    scratch = tempfile.mkdtemp(prefix="distributed_queue_")
+    model_server = StandInServer(workers, prefill, 0.001)
+    threading.Thread(target=model_server.serve_forever, daemon=True).start()
+
+    queue = JobQueue(os.path.join(scratch, "jobs.sqlite3"))
+    queue_server = None
+    queue_location = queue.path
+    if use_tcp:
+        queue_server = JobQueueServer(queue, ("127.0.0.1", 0))
+        threading.Thread(target=queue_server.serve_forever, daemon=True).start()
+        queue_location = "tcp://127.0.0.1:%d" % queue_server.server_address[1]
+
+    coordinator = Coordinator(queue, "stand-in", poll_seconds=0.1)
+    result = {}
+    coordinator_thread = threading.Thread(
+        target=lambda: result.update(coordinator.run([directory]))
+    )
+    processes = []
+
+    try:
+        started = time.perf_counter()
+        coordinator_thread.start()
+        while not queue.counts():
+            time.sleep(0.01)
+
+        processes = [
+            start_worker(queue_location, model_server.url, f"worker-{i}", lease_seconds)
+            for i in range(workers)
+        ]
+        if kill_after is not None and workers > 1:
+            time.sleep(kill_after)
+            processes[0].send_signal(signal.SIGKILL)
+
+        coordinator_thread.join()
+        elapsed = time.perf_counter() - started
+
+        renamed = sorted(os.listdir(directory))
+        if len(renamed) != images or any(
+            not name.startswith("red_car_on_a_highway") for name in renamed
+        ):
+            raise RuntimeError(f"Unexpected directory contents: {renamed[:5]}...")
+    finally:
+        coordinator.stop()
+        for process in processes:
+            process.wait()
+        if queue_server is not None:
+            queue_server.shutdown()
+            queue_server.server_close()
+        queue.close()
+        model_server.shutdown()
+        model_server.server_close()
+        shutil.rmtree(directory)
+        shutil.rmtree(scratch)
+
+    return dict(result, elapsed=elapsed)
+
+
+def main():
+    """Run single-worker and multi-worker batches and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--tcp", action="store_true")
+    parser.add_argument("--prefill-ms", type=float, default=100.0)
+    parser.add_argument("--lease-seconds", type=float, default=2.0)
+    parser.add_argument("--kill-after", type=float, default=2.0)
+    args = parser.parse_args()
+
+    for workers in sorted({1, args.workers}):
+        result = run(
+            args.images,
+            workers,
+            args.tcp,
+            args.lease_seconds,
+            args.kill_after,
+            args.prefill_ms / 1000,
+        )
+        print(
+            f"{workers} worker(s): {result['elapsed']:6.2f}s "
+            f"({args.images / result['elapsed']:5.1f} images/s), "
+            f"renamed {result['renamed']}, failed {result['failed']}, "
+            f"reassigned {result['reassigned']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
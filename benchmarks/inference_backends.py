@@ -0,0 +1,239 @@
+"""Benchmark inference backends against a local stand-in model server.
+
+Starts an HTTP server that speaks both Ollama's ``/api/chat`` and the
+OpenAI-compatible ``/v1/chat/completions`` streaming APIs. It models a
+server with a fixed number of parallel slots: each request waits for a
+slot, spends a fixed prefill time, then streams a short title token by
+token followed by trailing text the client is expected to cut off.
+
+Each backend then titles the same images through ``OllamaService`` with
+several requests in flight, so the results show request throughput,
+latency and how many TCP connections each client opened.
+
+Usage:
+    python -m benchmarks.inference_backends --images 100 --slots 4
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from models.ai_service import OllamaService
+from models.inference_backend import BACKENDS, OLLAMA
+
+TITLE_TOKENS = ["red", "_car", "_on", "_a", "_highway"]
+TRAILING_TOKENS = ["\n", "The", " image", " shows", " a", " car", "."]
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server with slot limiting and connection counting."""
+
+    daemon_threads = True
+
+    def __init__(self, slots, prefill, per_token):
+        """Start listening on a free local port.
+
+        Args:
+            slots: Requests processed concurrently
+            prefill: Seconds spent before the first token
+            per_token: Seconds between streamed tokens
+        """
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.slots = threading.Semaphore(slots)
+        self.prefill = prefill
+        self.per_token = per_token
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_connection(self):
+        """Record a newly accepted connection."""
+        with self._lock:
+            self.connections += 1
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves chunked streaming responses over keep-alive connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        """Count each TCP connection once."""
+        super().setup()
+        self.server.count_connection()
+
+    def log_message(self, format, *args):
+        """Keep the benchmark output quiet."""
+
+    def _send_json(self, body):
+        """Send a complete JSON response."""
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, data):
+        """Write one chunk of a chunked response."""
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        """List the stand-in model."""
+        if self.path == "/v1/models":
+            self._send_json({"object": "list", "data": [{"id": "stand-in"}]})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        """Stream a fake completion in the requested API's format."""
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length))
+
+        if self.path == "/api/chat":
+            content_type, frame = "application/x-ndjson", self._ollama_frame
+        elif self.path == "/v1/chat/completions":
+            content_type, frame = "text/event-stream", self._openai_frame
+        else:
+            self.send_error(404)
+            return
+
+        tokens = TITLE_TOKENS + TRAILING_TOKENS
+        tokens = tokens[: request.get("max_tokens") or len(tokens)]
+
+        with self.server.slots:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            time.sleep(self.server.prefill)
+
+            try:
+                for token in tokens:
+                    self._write_chunk(frame(token, done=False))
+                    time.sleep(self.server.per_token)
+                self._write_chunk(frame("", done=True))
+                if frame == self._openai_frame:
+                    self._write_chunk(b"data: [DONE]\n\n")
+                self._write_chunk(b"")
+            except (BrokenPipeError, ConnectionResetError):
+                # The client cut the stream off once it had a title
+                self.close_connection = True
+
+    @staticmethod
+    def _ollama_frame(token, done):
+        """Build one NDJSON line of an Ollama chat stream."""
+        line = {
+            "model": "stand-in",
+            "created_at": "2024-01-01T00:00:00Z",
+            "message": {"role": "assistant", "content": token},
+            "done": done,
+        }
+        return json.dumps(line).encode("utf-8") + b"\n"
+
+    @staticmethod
+    def _openai_frame(token, done):
+        """Build one server-sent event of an OpenAI chat stream."""
+        chunk = {
+            "object": "chat.completion.chunk",
+            "model": "stand-in",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {} if done else {"content": token},
+                    "finish_reason": "stop" if done else None,
+                }
+            ],
+        }
+        return f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+
+
+def run_backend(backend, server, images, concurrency, image_data):
+    """Title every image through one backend.
+
+    Args:
+        backend: Backend name
+        server: The running StandInServer
+        images: Number of images to title
+        concurrency: Requests kept in flight
+        image_data: Bytes sent as each image
+
+    Returns:
+        dict: Elapsed seconds, latency summary and connections opened
+    """
+    host = server.url if backend == OLLAMA else f"{server.url}/v1"
+    service = OllamaService(
+        "stand-in", backend=backend, hosts=[host], concurrency=concurrency
+    )
+    connections_before = server.connections
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        titles = list(
+            pool.map(
+                lambda i: service.generate_title(f"image_{i}.png", image_data),
+                range(images),
+            )
+        )
+    elapsed = time.perf_counter() - started
+    service.close()
+
+    if set(titles) != {"red_car_on_a_highway"}:
+        raise RuntimeError(f"Unexpected titles from {backend}: {set(titles)}")
+
+    return {
+        "elapsed": elapsed,
+        "p50": service.latency.percentile(50),
+        "p99": service.latency.percentile(99),
+        "connections": server.connections - connections_before,
+    }
+
+
+def main():
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=100)
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--prefill-ms", type=float, default=20.0)
+    parser.add_argument("--token-ms", type=float, default=2.0)
+    parser.add_argument("--image-kb", type=int, default=256)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        args.slots, args.prefill_ms / 1000, args.token_ms / 1000
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # A PNG header so backends label the data URL correctly
+    image_data = b"\x89PNG\r\n\x1a\n" + bytes(args.image_kb * 1024)
+
+    try:
+        for backend in args.backends:
+            result = run_backend(
+                backend, server, args.images, args.concurrency, image_data
+            )
+            print(
+                f"{backend:>7}: {result['elapsed']:6.2f}s "
+                f"({args.images / result['elapsed']:6.1f} images/s), "
+                f"p50 {result['p50'] * 1000:.0f}ms, "
+                f"p99 {result['p99'] * 1000:.0f}ms, "
+                f"{result['connections']} connection(s)"
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
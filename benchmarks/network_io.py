@@ -0,0 +1,251 @@
+"""Benchmark batch I/O against an artificially delayed filesystem.
+
+Simulates a network share by adding a fixed round-trip delay to every
+metadata call (stat, scandir, per-entry ``DirEntry.stat``, rename) and to
+every file open, plus a per-megabyte transfer cost on reads. Linux CIFS
+and NFS mounts pay a round trip per entry stat; pass ``--free-entry-stat``
+to model SMB on Windows, where stat data arrives with the listing.
+
+The batch runs through ``BatchRenamer``, the same widget-free loop the
+window uses, so title jobs, payload preparation and catalog hashing follow
+the same code path as the GUI. Inference is stubbed with a fixed sleep on a
+single slot, so the difference between the two runs is the I/O the batch
+waits on.
+
+Usage:
+    python -m benchmarks.network_io --files 200 --latency-ms 5
+"""
+
+import argparse
+import builtins
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from benchmarks.ui_scale import STUB_MODEL, StubService
+from models.batch_renamer import BatchRenamer
+from models.config import MAX_TITLE_LENGTH
+from models.scheduler import JobScheduler
+from utils.file_handler import FileHandler
+from utils.payload_cache import PayloadCache
+
+
+@contextmanager
+def delayed_filesystem(latency, seconds_per_mb, entry_stat=True):
+    """Patch filesystem calls to add network-like latency.
+
+    Args:
+        latency: Seconds added to every metadata call and file open
+        seconds_per_mb: Seconds added per megabyte read
+        entry_stat: Also delay ``DirEntry.stat`` from ``scandir``
+    """
+    originals = {
+        "stat": os.stat,
+        "listdir": os.listdir,
+        "rename": os.rename,
+        "replace": os.replace,
+        "open": os.open,
+        "unlink": os.unlink,
+    }
+    original_scandir = os.scandir
+    original_open = builtins.open
+
+    def delayed(func):
+        def wrapper(*args, **kwargs):
+            time.sleep(latency)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    class DelayedEntry:
+        def __init__(self, entry):
+            self._entry = entry
+
+        def stat(self, *args, **kwargs):
+            if entry_stat:
+                time.sleep(latency)
+            return self._entry.stat(*args, **kwargs)
+
+        def __getattr__(self, name):
+            return getattr(self._entry, name)
+
+    class DelayedScandir:
+        def __init__(self, scanner):
+            self._scanner = scanner
+
+        def __iter__(self):
+            return (DelayedEntry(entry) for entry in self._scanner)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._scanner.close()
+
+    def delayed_scandir(*args, **kwargs):
+        time.sleep(latency)
+        return DelayedScandir(original_scandir(*args, **kwargs))
+
+    class DelayedFile:
+        def __init__(self, file):
+            self._file = file
+
+        def read(self, *args):
+            data = self._file.read(*args)
+            time.sleep(len(data) / (1024 * 1024) * seconds_per_mb)
+            return data
+
+        def __getattr__(self, name):
+            return getattr(self._file, name)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._file.close()
+
+    def delayed_open(file, mode="r", *args, **kwargs):
+        time.sleep(latency)
+        return DelayedFile(original_open(file, mode, *args, **kwargs))
+
+    for name, func in originals.items():
+        setattr(os, name, delayed(func))
+    os.scandir = delayed_scandir
+    builtins.open = delayed_open
+    try:
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(os, name, func)
+        os.scandir = original_scandir
+        builtins.open = original_open
+
+
+def make_directory(count, size):
+    """Create a temporary directory of fake image files.
+
+    Args:
+        count: Number of files
+        size: Size of each file in bytes
+
+    Returns:
+        str: Path to the directory
+    """
+    directory = tempfile.mkdtemp(prefix="network_io_bench_")
+    payload = os.urandom(size)
+    for i in range(count):
+        with open(os.path.join(directory, f"IMG_{i:05d}.jpg"), "wb") as image_file:
+            image_file.write(payload)
+    return directory
+
+
+class _NullBus:
+    """Discards the batch's progress updates."""
+
+    def post_status(self, text):
+        pass
+
+    def post_preview(self, text):
+        pass
+
+    def post_select(self, index):
+        pass
+
+    def post_rename(self, index, new_filename):
+        pass
+
+
+def run_batch(directory, network_mode, scratch):
+    """Run the app's batch rename with stubbed inference and time it.
+
+    Args:
+        directory: Directory of images
+        network_mode: Whether to use the snapshot and read-ahead path
+        scratch: Directory for catalogs and caches
+
+    Returns:
+        float: Elapsed seconds
+    """
+    scheduler = JobScheduler()
+    cancel_event = threading.Event()
+    # No cache tiers: every run must read and prepare each image
+    service = StubService.from_model_choice(
+        STUB_MODEL,
+        MAX_TITLE_LENGTH,
+        cancel_event=cancel_event,
+        payload_cache=PayloadCache(scratch, memory_mb=0, disk_mb=0),
+    )
+
+    started = time.perf_counter()
+    file_handler = FileHandler(directory, network_mode=network_mode)
+    image_files = file_handler.get_image_files()
+    renamer = BatchRenamer(
+        file_handler,
+        image_files,
+        scheduler,
+        _NullBus(),
+        threading.Lock(),
+        catalog_dir=scratch,
+    )
+    try:
+        completed = renamer.run(service, STUB_MODEL, cancel_event)
+    finally:
+        service.close()
+        scheduler.shutdown()
+    elapsed = time.perf_counter() - started
+
+    if not completed or renamer.renamed_count != len(image_files):
+        raise RuntimeError(
+            f"Renamed {renamer.renamed_count}, failed {renamer.failed_count}"
+        )
+    return elapsed
+
+
+def main():
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--ms-per-mb", type=float, default=20.0)
+    parser.add_argument("--inference-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--free-entry-stat",
+        action="store_true",
+        help="Don't delay DirEntry.stat (SMB on Windows)",
+    )
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="network_io_scratch_")
+    StubService.inference_seconds = args.inference_ms / 1000
+
+    results = {}
+    try:
+        for network_mode in (False, True):
+            directory = make_directory(args.files, args.size_kb * 1024)
+            try:
+                with delayed_filesystem(
+                    args.latency_ms / 1000,
+                    args.ms_per_mb / 1000,
+                    entry_stat=not args.free_entry_stat,
+                ):
+                    results[network_mode] = run_batch(directory, network_mode, scratch)
+            finally:
+                shutil.rmtree(directory)
+    finally:
+        shutil.rmtree(scratch)
+
+    for network_mode, elapsed in results.items():
+        label = "network mode" if network_mode else "default"
+        print(
+            f"{label:>13}: {elapsed:6.2f}s "
+            f"({args.files / elapsed:6.1f} images/s)"
+        )
+    print(f"      speedup: {results[False] / results[True]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
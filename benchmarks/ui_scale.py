@@ -0,0 +1,520 @@
+"""Measure GUI responsiveness on large synthetic image directories.
+
+Generates a directory of small images (plus a few very large ones),
+drives ``MainWindow`` headlessly under Xvfb with a stubbed inference
+service, and writes a JSON report with:
+
+- populate: time for ``load_images`` to fill the listbox, and for the
+  background search index to become ready
+- preview: first-paint latency of ``on_image_select``, time until the
+  high-quality render is shown, and that render's cost on the Tk thread,
+  for small and large images
+- batch: throughput and listbox update cost while a batch rename runs
+- stalls: event-loop stalls seen by a 10 ms heartbeat, per phase
+- memory: resident set size after each phase
+
+The stub still prepares every payload (read, downscale, encode), so the
+batch phase includes the real client-side work; only the model call is
+replaced by a fixed sleep.
+
+Unverified: the window-driving phases have not yet been run end to end
+(no X display was available where the harness was written). Directory
+generation and the stubbed batch through ``BatchRenamer`` have been run;
+treat the first report from a machine with Xvfb as the harness's test.
+
+Usage:
+    python -m benchmarks.ui_scale --count 200000 --large-count 10 \\
+        --output ui_report.json
+    python -m benchmarks.ui_scale --directory /tmp/ui_bench --count 50000
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from io import BytesIO
+
+from PIL import Image
+
+from models.ai_service import OllamaService
+from utils.file_handler import FileHandler
+from utils.payload_cache import PayloadCache
+
+HEARTBEAT_MS = 10
+STALL_THRESHOLD_MS = 50  # Heartbeat delays above this count as stalls
+STUB_MODEL = "stub-vision"
+MANIFEST = "ui_scale_manifest.json"
+
+
+def _distribution(values):
+    """Summarize durations.
+
+    Args:
+        values: Durations in seconds
+
+    Returns:
+        dict: Count and p50/p90/p99/max/mean in milliseconds
+    """
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000
+
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(50), 2),
+        "p90_ms": round(percentile(90), 2),
+        "p99_ms": round(percentile(99), 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+    }
+
+
+def _rss_mb():
+    """Get the current resident set size.
+
+    Returns:
+        float: Resident memory in MB (peak RSS where /proc is unavailable)
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError):
+        # ru_maxrss is in KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return round(peak / scale, 1)
+
+
+def _encode_template(size, image_format, noise=True):
+    """Encode one synthetic image.
+
+    Args:
+        size: (width, height)
+        image_format: PIL format name, e.g. "JPEG"
+        noise: Use noise (realistic compression) rather than a flat color
+
+    Returns:
+        bytes: The encoded image
+    """
+    if noise:
+        image = Image.effect_noise(size, 64).convert("RGB")
+    else:
+        image = Image.new("RGB", size, (90, 120, 150))
+    output = BytesIO()
+    options = {"quality": 90} if image_format == "JPEG" else {}
+    image.save(output, image_format, **options)
+    return output.getvalue()
+
+
+FORMATS = {"jpg": "JPEG", "png": "PNG", "webp": "WEBP", "bmp": "BMP"}
+
+
+def make_directory(directory, count, formats, small_size, large_count, large_mp):
+    """Generate (or reuse) a synthetic image directory.
+
+    Every small file of a format shares one encoded template, so even
+    hundreds of thousands of files generate quickly. A manifest records
+    the parameters so matching directories are reused between runs.
+
+    Args:
+        directory: Target directory
+        count: Number of small images
+        formats: File extensions to cycle through
+        small_size: (width, height) of small images
+        large_count: Number of large images
+        large_mp: Megapixels of each large image
+
+    Returns:
+        dict: The generation parameters
+    """
+    params = {
+        "count": count,
+        "formats": list(formats),
+        "small_size": list(small_size),
+        "large_count": large_count,
+        "large_mp": large_mp,
+    }
+    manifest_path = os.path.join(directory, MANIFEST)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as manifest:
+            if json.load(manifest) == params:
+                return params
+    except (OSError, ValueError):
+        pass
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+    templates = {ext: _encode_template(small_size, FORMATS[ext]) for ext in formats}
+    for i in range(count):
+        ext = formats[i % len(formats)]
+        with open(os.path.join(directory, f"IMG_{i:07d}.{ext}"), "wb") as image_file:
+            image_file.write(templates[ext])
+
+    if large_count:
+        width = int((large_mp * 1_000_000 * 4 / 3) ** 0.5)
+        large = _encode_template((width, width * 3 // 4), "JPEG")
+        for i in range(large_count):
+            large_path = os.path.join(directory, f"large_{i:03d}.jpg")
+            with open(large_path, "wb") as image_file:
+                image_file.write(large)
+
+    with open(manifest_path, "w", encoding="utf-8") as manifest:
+        json.dump(params, manifest)
+    return params
+
+
+@contextmanager
+def virtual_display(mode):
+    """Provide an X display, starting Xvfb when requested or available.
+
+    Args:
+        mode: "xvfb" to require Xvfb, "existing" to use $DISPLAY, or
+            "auto" to prefer Xvfb and fall back to $DISPLAY
+
+    Raises:
+        SystemExit: If no display can be provided
+    """
+    use_xvfb = mode == "xvfb" or (mode == "auto" and shutil.which("Xvfb"))
+    if not use_xvfb:
+        if not os.environ.get("DISPLAY"):
+            raise SystemExit("No display: install Xvfb or set DISPLAY")
+        yield
+        return
+
+    if shutil.which("Xvfb") is None:
+        raise SystemExit("Xvfb not found")
+
+    # -displayfd makes Xvfb pick a free display and report its number
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(
+        ["Xvfb", "-displayfd", str(write_fd), "-screen", "0", "1280x1024x24"],
+        pass_fds=(write_fd,),
+        stderr=subprocess.DEVNULL,
+    )
+    os.close(write_fd)
+    with os.fdopen(read_fd) as display_pipe:
+        number = display_pipe.readline().strip()
+    if not number:
+        process.kill()
+        raise SystemExit("Xvfb failed to start")
+
+    previous = os.environ.get("DISPLAY")
+    os.environ["DISPLAY"] = f":{number}"
+    try:
+        yield
+    finally:
+        process.terminate()
+        process.wait()
+        if previous is None:
+            os.environ.pop("DISPLAY", None)
+        else:
+            os.environ["DISPLAY"] = previous
+
+
+class StubService(OllamaService):
+    """OllamaService that prepares payloads but replaces inference with a sleep."""
+
+    inference_seconds = 0.005
+    _counter = 0
+    _counter_lock = threading.Lock()
+
+    @staticmethod
+    def get_available_models():
+        """Offer a single stub model."""
+        return [STUB_MODEL]
+
+    def supports_vision(self):
+        """The stub accepts images."""
+        return True
+
+    def generate_title(self, image_path, image_data=None):
+        """Encode the image as usual, then return a unique fake title."""
+        self._encode_image(image_path, image_data)
+        time.sleep(self.inference_seconds)
+        self.latency.record(self.inference_seconds)
+        with StubService._counter_lock:
+            StubService._counter += 1
+            return f"stub_title_{StubService._counter:07d}"
+
+
+class Heartbeat:
+    """Measures event-loop stalls with a periodic ``after`` callback."""
+
+    def __init__(self, root):
+        """Start the heartbeat.
+
+        Args:
+            root: The Tk root window
+        """
+        self.root = root
+        self.delays = []
+        self._expected = time.perf_counter() + HEARTBEAT_MS / 1000
+        self.root.after(HEARTBEAT_MS, self._beat)
+
+    def _beat(self):
+        """Record how late this beat ran and schedule the next."""
+        now = time.perf_counter()
+        self.delays.append(max(0.0, now - self._expected))
+        self._expected = now + HEARTBEAT_MS / 1000
+        self.root.after(HEARTBEAT_MS, self._beat)
+
+    def take(self):
+        """Summarize and reset the delays recorded so far.
+
+        Returns:
+            dict: Stall count, total and distribution of all beat delays
+        """
+        delays, self.delays = self.delays, []
+        stalls = [d for d in delays if d * 1000 > STALL_THRESHOLD_MS]
+        return {
+            "beats": len(delays),
+            "stalls": len(stalls),
+            "stalled_ms": round(sum(stalls) * 1000, 1),
+            "delay": _distribution(delays),
+        }
+
+
+class Timed:
+    """Wraps a method to record how long each call takes."""
+
+    def __init__(self, owner, name):
+        """Install the wrapper on an instance.
+
+        Args:
+            owner: Object whose method is wrapped
+            name: Method name
+        """
+        self.durations = []
+        original = getattr(owner, name)
+
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.durations.append(time.perf_counter() - started)
+
+        setattr(owner, name, wrapper)
+
+
+def pump(root, seconds=None, until=None, timeout=600.0):
+    """Run the Tk event loop for a while.
+
+    Args:
+        root: The Tk root window
+        seconds: Run for this long
+        until: Or run until this callable returns True
+        timeout: Upper bound when waiting on ``until``
+    """
+    end = time.perf_counter() + (seconds if seconds is not None else timeout)
+    while time.perf_counter() < end:
+        root.update()
+        if until is not None and until():
+            return
+        time.sleep(0.001)
+    if until is not None:
+        raise TimeoutError("UI did not reach the expected state in time")
+
+
+def run(directory, args, scratch):
+    """Drive the window through each phase and collect measurements.
+
+    Args:
+        directory: Synthetic image directory
+        args: Parsed command-line arguments
+        scratch: Directory for catalogs and caches
+
+    Returns:
+        dict: The report
+    """
+    import ttkbootstrap as ttk
+
+    import ui.main_window as main_window
+    from models.config import THEME_NAME, WINDOW_GEOMETRY
+
+    StubService.inference_seconds = args.inference_ms / 1000
+    main_window.OllamaService = StubService
+
+    report = {"memory_mb": {"start": _rss_mb()}, "stalls": {}}
+    root = ttk.Window(themename=THEME_NAME)
+    root.geometry(WINDOW_GEOMETRY)
+    window = main_window.MainWindow(root)
+    window.payload_cache = PayloadCache(
+        cache_dir=os.path.join(scratch, "payloads"), disk_mb=0
+    )
+    # Keep benchmark catalogs out of the user's cache directory
+    window.catalog_dir = os.path.join(scratch, "catalogs")
+    heartbeat = Heartbeat(root)
+    pump(root, seconds=0.5)
+    heartbeat.take()
+    report["memory_mb"]["window"] = _rss_mb()
+
+    # Populate
+    started = time.perf_counter()
+    window._use_file_handler(FileHandler(directory))
+    window.load_images()
+    root.update_idletasks()
+    populated = time.perf_counter() - started
+    pump(root, until=lambda: window.search_index.ready)
+    report["populate"] = {
+        "images": len(window.image_files),
+        "listbox_ms": round(populated * 1000, 1),
+        "search_index_ready_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    report["stalls"]["populate"] = heartbeat.take()
+    report["memory_mb"]["populated"] = _rss_mb()
+
+    # Preview
+    viewer = window.image_viewer
+    render = Timed(viewer, "_render_source")
+    large = [
+        i for i, name in enumerate(window.image_files) if name.startswith("large_")
+    ]
+    large_set = set(large)
+    small = [i for i in range(len(window.image_files)) if i not in large_set]
+    rng = random.Random(args.seed)
+    samples = {
+        "small": rng.sample(small, min(args.previews, len(small))),
+        "large": large[: args.previews],
+    }
+    report["preview"] = {}
+    for kind, indices in samples.items():
+        first_paint = []
+        refined = []
+        render.durations = []
+        for index in indices:
+            row = window._row_for_index(index)
+            window.image_listbox.selection_clear(0, "end")
+            window.image_listbox.selection_set(row)
+            started = time.perf_counter()
+            window.on_image_select(None)
+            root.update_idletasks()
+            first_paint.append(time.perf_counter() - started)
+            # The refine is pending until its render has run
+            pump(root, until=lambda: viewer._refine_job is None, timeout=30)
+            refined.append(time.perf_counter() - started)
+            pump(root, seconds=args.dwell_ms / 1000)
+        report["preview"][kind] = {
+            "first_paint": _distribution(first_paint),
+            "refined": _distribution(refined),
+            "refine_render": _distribution(render.durations),
+        }
+    report["stalls"]["preview"] = heartbeat.take()
+    report["memory_mb"]["previewed"] = _rss_mb()
+
+    # Batch rename with the stub model
+    # The bus holds its own reference to _update_listbox_items, so wrap it there
+    updates = Timed(window.update_bus, "on_renames")
+    window.model_combo.set(STUB_MODEL)
+    started = time.perf_counter()
+    window.start_ai_rename()
+    try:
+        pump(root, seconds=args.batch_seconds, until=lambda: not window.is_processing)
+    except TimeoutError:
+        pass
+    if window.is_processing:
+        window.cancel_processing()
+        pump(root, until=lambda: not window.is_processing, timeout=60)
+    elapsed = time.perf_counter() - started
+    renamed = sum(1 for name in window.image_files if name.startswith("stub_title_"))
+    report["batch"] = {
+        "renamed": renamed,
+        "seconds": round(elapsed, 2),
+        "images_per_second": round(renamed / elapsed, 1),
+        "listbox_updates": _distribution(updates.durations),
+    }
+    report["stalls"]["batch"] = heartbeat.take()
+    report["memory_mb"]["batch"] = _rss_mb()
+    report["memory_mb"]["growth"] = round(
+        report["memory_mb"]["batch"] - report["memory_mb"]["window"], 1
+    )
+
+    window.shutdown()
+    return report
+
+
+def main():
+    """Generate the directory, run the harness and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--directory", help="Reuse or create this directory")
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--formats", default="jpg,png")
+    parser.add_argument("--small-size", default="640x480")
+    parser.add_argument("--large-count", type=int, default=10)
+    parser.add_argument("--large-mp", type=float, default=50.0)
+    parser.add_argument("--previews", type=int, default=50)
+    parser.add_argument("--dwell-ms", type=float, default=250.0)
+    parser.add_argument("--inference-ms", type=float, default=5.0)
+    parser.add_argument("--batch-seconds", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--display", choices=("auto", "xvfb", "existing"), default="auto"
+    )
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="ui_scale_")
+    directory = args.directory or os.path.join(scratch, "images")
+    small_size = tuple(int(v) for v in args.small_size.split("x"))
+
+    try:
+        started = time.perf_counter()
+        params = make_directory(
+            directory,
+            args.count,
+            args.formats.split(","),
+            small_size,
+            args.large_count,
+            args.large_mp,
+        )
+        generated = time.perf_counter() - started
+
+        # Renames from a previous run would change what is measured
+        if args.directory:
+            working = os.path.join(scratch, "images")
+            shutil.copytree(directory, working)
+            directory = working
+
+        with virtual_display(args.display):
+            report = run(directory, args, scratch)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report["config"] = dict(
+        params,
+        previews=args.previews,
+        dwell_ms=args.dwell_ms,
+        inference_ms=args.inference_ms,
+        batch_seconds=args.batch_seconds,
+        seed=args.seed,
+        generate_seconds=round(generated, 1),
+    )
+    report["environment"] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Command-line entry point for distributed (coordinator/worker) renaming.
+
+The coordinator scans directories and publishes one job per image to a
+shared queue; workers on any number of hosts generate titles with their
+local model server; the coordinator applies the renames.
+
+Usage:
+    # Queue on a shared volume
+    python distributed_rename.py coordinator /mnt/photos --model llava:7b \\
+        --queue /mnt/shared/jobs.sqlite3
+    python distributed_rename.py worker --queue /mnt/shared/jobs.sqlite3
+
+    # Queue served over TCP by the coordinator
+    python distributed_rename.py coordinator /mnt/photos --model llava:7b \\
+        --serve 0.0.0.0:7070
+    python distributed_rename.py worker --queue tcp://coordinator:7070
+"""
+
+import argparse
+import signal
+import threading
+
+from models.config import JOB_QUEUE_PATH, JOB_LEASE_SECONDS
+from models.distributed import Coordinator, Worker
+from utils.job_queue import JobQueue, JobQueueServer, open_job_queue
+
+
+def _parse_address(address):
+    """Split a ``host:port`` string.
+
+    Args:
+        address: Address to split
+
+    Returns:
+        tuple[str, int]: (host, port)
+    """
+    host, _, port = address.rpartition(":")
+    return host, int(port)
+
+
+def run_coordinator(args):
+    """Publish jobs and apply titles.
+
+    Args:
+        args: Parsed command-line arguments
+    """
+    server = None
+    if args.serve:
+        queue = JobQueue(args.queue)
+        server = JobQueueServer(queue, _parse_address(args.serve))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"Serving job queue on {args.serve}")
+    else:
+        queue = open_job_queue(args.queue)
+
+    coordinator = Coordinator(queue, args.model)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: coordinator.stop())
+
+    try:
+        result = coordinator.run(args.directories, only_new=args.only_new)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        queue.close()
+
+    print(
+        f"Renamed {result['renamed']}, failed {result['failed']}, "
+        f"reassigned {result['reassigned']} expired lease(s)"
+    )
+
+
+def run_worker(args):
+    """Lease jobs and report titles.
+
+    Args:
+        args: Parsed command-line arguments
+    """
+    path_map = None
+    if args.path_map:
+        remote_prefix, _, local_prefix = args.path_map.partition("=")
+        path_map = (remote_prefix, local_prefix)
+
+    queue = open_job_queue(args.queue)
+    worker = Worker(
+        queue,
+        worker_id=args.worker_id,
+        hosts=args.host or None,
+        lease_seconds=args.lease_seconds,
+        path_map=path_map,
+    )
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: worker.stop())
+
+    try:
+        processed = worker.run(exit_when_idle=args.exit_when_idle)
+    finally:
+        queue.close()
+    print(f"Worker {worker.worker_id} processed {processed} job(s)")
+
+
+def main():
+    """Parse arguments and run the requested role."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    roles = parser.add_subparsers(dest="role", required=True)
+
+    coordinator = roles.add_parser("coordinator", help="Publish jobs and rename")
+    coordinator.add_argument("directories", nargs="+")
+    coordinator.add_argument("--model", required=True, help="Model for workers")
+    coordinator.add_argument("--queue", default=JOB_QUEUE_PATH)
+    coordinator.add_argument(
+        "--serve", metavar="HOST:PORT", help="Also serve the queue over TCP"
+    )
+    coordinator.add_argument(
+        "--only-new", action="store_true", help="Skip cataloged files"
+    )
+    coordinator.set_defaults(handler=run_coordinator)
+
+    worker = roles.add_parser("worker", help="Generate titles for queued jobs")
+    worker.add_argument("--queue", default=JOB_QUEUE_PATH)
+    worker.add_argument("--worker-id")
+    worker.add_argument(
+        "--host", action="append", help="Inference endpoint (repeatable)"
+    )
+    worker.add_argument("--lease-seconds", type=float, default=JOB_LEASE_SECONDS)
+    worker.add_argument(
+        "--path-map",
+        metavar="REMOTE=LOCAL",
+        help="Rewrite the coordinator's path prefix to this host's mount",
+    )
+    worker.add_argument(
+        "--exit-when-idle", action="store_true", help="Stop when the queue is empty"
+    )
+    worker.set_defaults(handler=run_worker)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
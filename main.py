@@ -1,18 +1,39 @@
 """Main entry point for the Image Viewer application."""
 
+import signal
+
 import ttkbootstrap as ttk
 
 from models.config import WINDOW_TITLE, WINDOW_GEOMETRY, THEME_NAME
 from ui.main_window import MainWindow
 
 
+def _keep_signals_responsive(root):
+    """Wake the Python interpreter periodically so signal handlers can run.
+
+    Tk's main loop runs in C, so without this a Ctrl+C is only handled the
+    next time some UI event happens.
+
+    Args:
+        root: The root tkinter window
+    """
+    root.after(200, _keep_signals_responsive, root)
+
+
 def main():
     """Initialize and run the application."""
     root = ttk.Window(themename=THEME_NAME)
     root.title(WINDOW_TITLE)
     root.geometry(WINDOW_GEOMETRY)
 
-    _ = MainWindow(root)  # Keep reference to prevent garbage collection
+    window = MainWindow(root)
+
+    # Cancel any running rename cleanly on window close, Ctrl+C or SIGTERM
+    root.protocol("WM_DELETE_WINDOW", window.shutdown)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: root.after(0, window.shutdown))
+    _keep_signals_responsive(root)
+
     root.mainloop()
 
 
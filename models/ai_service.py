@@ -1,50 +1,431 @@
-"""AI service for image analysis using Ollama."""
+"""AI service for image analysis using Ollama or OpenAI-compatible servers."""
 
 import base64
-import ollama
-from ollama import chat
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from io import BytesIO
 
+from PIL import Image
 
-class OllamaService:
-    """Handles AI-powered image analysis using Ollama models."""
+from models.config import (
+    INFERENCE_BACKEND,
+    INFERENCE_SLOTS,
+    REQUEST_TIMEOUT,
+    HEDGE_PERCENTILE,
+    HEDGE_MIN_SAMPLES,
+    CANCEL_POLL_SECONDS,
+    PAYLOAD_MAX_SIZE,
+    PAYLOAD_JPEG_QUALITY,
+)
+from models.inference_backend import (
+    create_backend,
+    default_hosts,
+    enabled_backends,
+    model_choice,
+    parse_model_choice,
+)
+from models.latency import LatencyTracker
+from utils.catalog import ImageCatalog
+from utils.payload_cache import PayloadCache
+
+# Formats every backend accepts as-is, sent unchanged when small enough
+PASSTHROUGH_FORMATS = ("JPEG", "PNG")
+
+
+class VisionNotSupportedError(Exception):
+    """Raised when a model is confirmed not to accept image input."""
+
+
+class ModelRefusalError(Exception):
+    """Raised when a model declines to describe an image."""
 
-    def __init__(self, model_name="mistral", max_title_length=30):
+
+class RequestCancelledError(Exception):
+    """Raised when a request is aborted by the user."""
+
+
+class OllamaService:
+    """Handles AI-powered image analysis using Ollama models.
+
+    Requests go through an ``InferenceBackend``: Ollama's own API by
+    default, or an OpenAI-compatible chat-completions server.
+    """
+
+    def __init__(
+        self,
+        model_name="mistral",
+        max_title_length=30,
+        backend=INFERENCE_BACKEND,
+        hosts=None,
+        request_timeout=REQUEST_TIMEOUT,
+        hedge_percentile=HEDGE_PERCENTILE,
+        latency=None,
+        cancel_event=None,
+        concurrency=INFERENCE_SLOTS,
+        payload_cache=None,
+    ):
         """Initialize the Ollama service.
 
         Args:
-            model_name: Name of the Ollama model to use
+            model_name: Name of the model to use
             max_title_length: Maximum length for generated titles
+            backend: Inference backend name, "ollama" or "openai"
+            hosts: Endpoints to use; None means the configured hosts for
+                the backend, empty means the backend's default host
+            request_timeout: Deadline in seconds for a single title request
+            hedge_percentile: Latency percentile after which a duplicate
+                request is issued, or None to disable hedging
+            latency: Optional LatencyTracker shared between services
+            cancel_event: Optional threading.Event that aborts requests when set
+            concurrency: Number of requests callers may run at once
+            payload_cache: PayloadCache to share between services; a new
+                one (backed by the shared on-disk tier) is used if None
         """
         self.model_name = model_name
         self.max_title_length = max_title_length
+        self.request_timeout = request_timeout
+        self.hedge_percentile = hedge_percentile
+        self.latency = latency or LatencyTracker()
+        self.cancel_event = cancel_event or threading.Event()
+        self.payload_cache = payload_cache or PayloadCache()
+
+        if hosts is None:
+            hosts = default_hosts(backend)
+        self._backends = [
+            create_backend(backend, host, request_timeout) for host in (hosts or [None])
+        ]
+        self._next_backend = 0
+        # Two workers per concurrent request: one for it, one for its hedge
+        self._executor = ThreadPoolExecutor(
+            max_workers=2 * max(len(self._backends), concurrency),
+            thread_name_prefix="inference",
+        )
 
-    def _encode_image(self, image_path):
-        """Encode image to base64 for Ollama.
+    @classmethod
+    def from_model_choice(cls, choice, max_title_length=30, **kwargs):
+        """Create a service for a model combobox label.
 
         Args:
-            image_path: Path to the image file
+            choice: Label from ``get_available_models``, e.g. ``llava:7b``
+                or ``openai:qwen2-vl-7b``
+            max_title_length: Maximum length for generated titles
+            **kwargs: Further constructor arguments
+
+        Returns:
+            OllamaService: Service using the label's backend and model
+        """
+        backend, model_name = parse_model_choice(choice)
+        return cls(model_name, max_title_length, backend=backend, **kwargs)
+
+    def _pick_backend(self):
+        """Get the next endpoint in round-robin order.
+
+        Returns:
+            InferenceBackend: The backend to send the next request to
+        """
+        backend = self._backends[self._next_backend % len(self._backends)]
+        self._next_backend += 1
+        return backend
+
+    def supports_vision(self):
+        """Check whether the model is known to accept images.
+
+        Returns:
+            bool: False only if the model is known to be text-only
+        """
+        return self._backends[0].supports_vision(self.model_name)
+
+    def _hedge_delay(self):
+        """Get how long to wait before issuing a hedged duplicate request.
+
+        Returns:
+            float | None: Delay in seconds, or None if hedging is not active
+        """
+        if self.hedge_percentile is None:
+            return None
+        if self.latency.sample_count() < HEDGE_MIN_SAMPLES:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+
+    def cancel(self):
+        """Abort the in-flight request and any later ones."""
+        self.cancel_event.set()
+
+    @staticmethod
+    def _sanitize_title(text):
+        """Turn raw model output into a filesystem-friendly title.
+
+        Args:
+            text: Raw model response
+
+        Returns:
+            str: Sanitized title, not yet truncated
+        """
+        # Remove quotes if present
+        title = text.strip().strip("'\"")
+
+        # Sanitize: lowercase, replace spaces with underscores
+        title = title.lower().replace(" ", "_")
+
+        # Remove any non-alphanumeric characters except underscores
+        return "".join(c for c in title if c.isalnum() or c == "_")
+
+    def _stream_chat(self, backend, messages, abandon=None):
+        """Stream a chat response, stopping once a complete title has arrived.
+
+        A title is complete at the first newline after some content, or once
+        the sanitized text is longer than ``max_title_length`` (everything
+        after that would be truncated anyway).
+
+        Args:
+            backend: The InferenceBackend to use
+            messages: Chat messages to send
+            abandon: Event set when this attempt lost a hedge or timed out
 
         Returns:
-            bytes: Base64 encoded image data
+            str: The response text received before the cutoff
+
+        Raises:
+            RequestCancelledError: If the service was cancelled or the
+                attempt abandoned mid-stream
+        """
+        started = time.monotonic()
+        stream = backend.stream_chat(self.model_name, messages)
+        content = ""
+        chunks = 0
+        first_chunk_at = None
+        cut_off = False
+
+        try:
+            for text, done in stream:
+                if self.cancel_event.is_set():
+                    raise RequestCancelledError("Request cancelled")
+                if abandon is not None and abandon.is_set():
+                    raise RequestCancelledError("Request abandoned")
+
+                if first_chunk_at is None:
+                    first_chunk_at = time.monotonic()
+                content += text
+                chunks += 1
+
+                stripped = content.lstrip()
+                if "\n" in stripped:
+                    content = stripped.split("\n", 1)[0]
+                    cut_off = not done
+                    break
+                if len(self._sanitize_title(stripped)) > self.max_title_length:
+                    cut_off = not done
+                    break
+        finally:
+            # Closing the stream closes the HTTP response, which stops the
+            # server from generating the rest of the completion
+            stream.close()
+
+        if first_chunk_at is None:
+            self.latency.record_stream(0, None, 0.0, cut_off)
+        else:
+            self.latency.record_stream(
+                chunks,
+                first_chunk_at - started,
+                time.monotonic() - first_chunk_at,
+                cut_off,
+            )
+        return content
+
+    def _chat(self, messages):
+        """Send a chat request with a deadline and optional hedging.
+
+        If the request is still running after the configured latency
+        percentile, a duplicate is sent to the next endpoint (or another
+        slot on the same one) and whichever finishes first is used. The
+        slower request (or every request, on timeout) is abandoned: its
+        stream is closed at the next chunk, freeing the worker thread and
+        the server slot.
+
+        Args:
+            messages: Chat messages to send
+
+        Returns:
+            str: Response text from the first request to finish
+
+        Raises:
+            TimeoutError: If no response arrives before the deadline
+            RequestCancelledError: If the service is cancelled while waiting
+        """
+        started = time.monotonic()
+        deadline = started + self.request_timeout
+        abandon_events = {}
+
+        def submit():
+            abandon = threading.Event()
+            future = self._executor.submit(
+                self._stream_chat, self._pick_backend(), messages, abandon
+            )
+            abandon_events[future] = abandon
+            return future
+
+        def abandon(futures):
+            for future in futures:
+                future.cancel()
+                abandon_events[future].set()
+
+        def wait_or_cancel(futures, timeout, return_when=FIRST_COMPLETED):
+            # Wait in short slices so cancellation is noticed promptly
+            end = time.monotonic() + timeout
+            while True:
+                if self.cancel_event.is_set():
+                    abandon(futures)
+                    raise RequestCancelledError("Request cancelled")
+                remaining = end - time.monotonic()
+                done, not_done = wait(
+                    futures,
+                    timeout=max(0, min(remaining, CANCEL_POLL_SECONDS)),
+                    return_when=return_when,
+                )
+                if done or remaining <= 0:
+                    return done, not_done
+
+        pending = {submit()}
+        hedge = None
+
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is not None:
+            done, _ = wait_or_cancel(
+                pending, min(hedge_delay, self.request_timeout)
+            )
+            if not done:
+                hedge = submit()
+                pending.add(hedge)
+
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait_or_cancel(pending, remaining)
+            winner = next((f for f in done if f.exception() is None), None)
+            if winner is None:
+                if pending:
+                    # One attempt failed - let the other one finish
+                    continue
+                # Every attempt failed - surface the error
+                return next(iter(done)).result()
+
+            abandon(pending)
+            if hedge is not None:
+                self.latency.record_hedge(won=winner is hedge)
+            self.latency.record(time.monotonic() - started)
+            return winner.result()
+
+        abandon(pending)
+        self.latency.record_timeout()
+        raise TimeoutError(
+            f"No response from '{self.model_name}' within {self.request_timeout:g}s"
+        )
+
+    def close(self):
+        """Release worker threads and connections, abandoning requests."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for backend in self._backends:
+            backend.close()
+
+    @staticmethod
+    def _prepare_payload(image_data):
+        """Shrink and re-encode an image for the model if needed.
+
+        JPEG and PNG images within ``PAYLOAD_MAX_SIZE`` are sent unchanged
+        (only the header is parsed). Anything larger, or in another format,
+        is decoded at reduced scale and re-encoded as JPEG.
+
+        Args:
+            image_data: The original file contents
+
+        Returns:
+            bytes: Encoded image payload
         """
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode("utf-8")
+        try:
+            image = Image.open(BytesIO(image_data))
+        except OSError:
+            # Not something Pillow can read - let the model server decide
+            return image_data
+        if (
+            image.format in PASSTHROUGH_FORMATS
+            and max(image.size) <= PAYLOAD_MAX_SIZE
+        ):
+            return image_data
+
+        # Let JPEG decode at a reduced scale (no-op for other formats)
+        image.draft("RGB", (PAYLOAD_MAX_SIZE, PAYLOAD_MAX_SIZE))
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.thumbnail(
+            (PAYLOAD_MAX_SIZE, PAYLOAD_MAX_SIZE), Image.Resampling.BICUBIC
+        )
+
+        output = BytesIO()
+        image.save(output, "JPEG", quality=PAYLOAD_JPEG_QUALITY)
+        return output.getvalue()
+
+    def _encode_image(self, image_path, image_data=None):
+        """Encode image to base64 for the inference backend.
+
+        Payloads are cached by source identity, target size and format, so
+        re-running a batch or switching models does no image decoding.
+        Files are identified by their stat signature, which avoids reading
+        them on a cache hit; data already in memory (read-ahead, archive
+        members) is identified by its content hash.
+
+        Args:
+            image_path: Path to the image file, or an archive member
+            image_data: Already-read file contents, if available
 
-    def generate_title(self, image_path):
+        Returns:
+            str: Base64 encoded image data
+        """
+        if image_data is None and hasattr(image_path, "read_bytes"):
+            image_data = image_path.read_bytes()
+
+        if image_data is None:
+            stat = os.stat(image_path)
+            source = ("stat", stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        else:
+            source = ("hash", ImageCatalog.hash_bytes(image_data))
+        key = (source, PAYLOAD_MAX_SIZE, "jpeg", PAYLOAD_JPEG_QUALITY)
+
+        def create():
+            data = image_data
+            if data is None:
+                with open(image_path, "rb") as image_file:
+                    data = image_file.read()
+            return self._prepare_payload(data)
+
+        payload = self.payload_cache.get_or_create(key, create)
+        return base64.b64encode(payload).decode("utf-8")
+
+    def generate_title(self, image_path, image_data=None):
         """Generate a descriptive title for an image.
 
+        The response is streamed and reading stops as soon as a complete
+        title has arrived.
+
         Args:
             image_path: Path to the image file
+            image_data: Already-read file contents (e.g. from read-ahead)
 
         Returns:
             str: Generated title for the image (max 30 chars)
 
         Raises:
-            Exception: If the Ollama service fails
+            VisionNotSupportedError: If a model confirmed to be text-only
+                refuses to analyze the image
+            ModelRefusalError: If any other model refuses to analyze it
+            RequestCancelledError: If the service was cancelled
+            Exception: If the inference backend fails
         """
         try:
             # Encode image
-            image_base64 = self._encode_image(image_path)
+            image_base64 = self._encode_image(image_path, image_data)
 
             # Create prompt for concise title generation
             prompt = (
@@ -56,20 +437,16 @@ class OllamaService:
                 f"Respond with ONLY the title, nothing else."
             )
 
-            # Send to Ollama
-            response = chat(
-                model=self.model_name,
-                messages=[
+            # Send to the inference backend
+            title = self._chat(
+                [
                     {
                         "role": "user",
                         "content": prompt,
                         "images": [image_base64],
                     }
-                ],
-            )
-
-            # Extract and clean the title
-            title = response["message"]["content"].strip()
+                ]
+            ).strip()
 
             # Detect if model doesn't support vision (common error responses)
             error_indicators = [
@@ -84,20 +461,20 @@ class OllamaService:
             ]
             title_lower = title.lower()
             if any(indicator in title_lower for indicator in error_indicators):
-                raise Exception(
-                    f"Model '{self.model_name}' appears to not support vision. "
-                    f"Response: {title[:100]}... "
-                    f"Please use a vision-capable model like llama3.2-vision, llava, etc."
+                # Only metadata can tell a text-only model from a vision
+                # model refusing this one image (e.g. a blank placeholder)
+                if self._backends[0].confirms_non_vision(self.model_name):
+                    raise VisionNotSupportedError(
+                        f"Model '{self.model_name}' does not support vision. "
+                        f"Response: {title[:100]}... "
+                        f"Please use a vision-capable model like "
+                        f"llama3.2-vision, llava, etc."
+                    )
+                raise ModelRefusalError(
+                    f"Model declined to describe the image: {title[:100]}"
                 )
 
-            # Remove quotes if present
-            title = title.strip("'\"")
-
-            # Sanitize: lowercase, replace spaces with underscores
-            title = title.lower().replace(" ", "_")
-
-            # Remove any non-alphanumeric characters except underscores
-            title = "".join(c for c in title if c.isalnum() or c == "_")
+            title = self._sanitize_title(title)
 
             # Truncate to max length
             if len(title) > self.max_title_length:
@@ -109,65 +486,48 @@ class OllamaService:
 
             return title
 
+        except (VisionNotSupportedError, ModelRefusalError, RequestCancelledError):
+            raise
         except Exception as e:
             raise Exception(f"Failed to generate title: {str(e)}") from e
 
     def test_connection(self):
-        """Test if Ollama service is available.
+        """Test if the inference backend is available.
 
         Returns:
             bool: True if service is available, False otherwise
         """
         try:
             # Try a simple chat without image
-            response = chat(
-                model=self.model_name,
-                messages=[{"role": "user", "content": "test"}],
-            )
+            response = self._chat([{"role": "user", "content": "test"}])
             return response is not None
         except Exception:
             return False
 
     @staticmethod
     def get_available_models():
-        """Get list of available vision-capable Ollama models installed locally.
+        """Get vision-capable models from every enabled backend.
 
-        Only returns models that support image analysis (multimodal models).
-        Text-only models like standard mistral, llama2, llama3.2 are filtered out.
+        For Ollama, vision support is read from model metadata via the
+        cached ``ModelRegistry`` rather than guessed from the model name.
+        Models on backends other than the configured default are labelled
+        with the backend name (see ``model_choice``).
 
         Returns:
-            list[str]: List of vision-capable model names, or empty list if none available
+            list[str]: Model combobox labels, or empty list if none available
         """
-        # Known vision-capable model identifiers
-        VISION_MODELS = [
-            "llama3.2-vision",
-            "llama4",  # Llama 4 models are multimodal
-            "llava",
-            "bakllava",
-            "qwen2-vl",
-            "qwen-vl",
-            "mistral-small",  # Mistral Small 3.1 has vision
-            "pixtral",  # Mistral's vision model
-            "moondream",
-            "cogvlm",
-        ]
-
-        try:
-            all_models = ollama.list()
-            if not all_models or not all_models.models:
-                return []
-
-            model_names = [m.model for m in all_models.models]
-
-            # Filter to only vision-capable models
-            vision_models = []
-            for model in model_names:
-                if model is not None:
-                    model_lower = model.lower()
-                    # Check if model name contains any vision model identifier
-                    if any(vision_id in model_lower for vision_id in VISION_MODELS):
-                        vision_models.append(model)
-
-            return vision_models
-        except Exception:
-            return []
+        models = []
+        for backend_name in enabled_backends():
+            for host in default_hosts(backend_name) or [None]:
+                backend = create_backend(backend_name, host)
+                try:
+                    names = backend.list_models()
+                except Exception:
+                    continue
+                finally:
+                    backend.close()
+                for name in names:
+                    label = model_choice(backend_name, name)
+                    if label not in models:
+                        models.append(label)
+        return models
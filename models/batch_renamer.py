@@ -0,0 +1,282 @@
+"""Batch AI renaming of an image list, independent of any widgets."""
+
+from collections import deque
+
+from models.ai_service import (
+    ModelRefusalError,
+    RequestCancelledError,
+    VisionNotSupportedError,
+)
+from models.config import BULK_WINDOW, CATALOG_DIR, REFUSAL_ABORT_LIMIT
+from models.scheduler import BULK
+from utils.catalog import ImageCatalog
+from utils.readahead import ReadaheadPool
+
+
+class BatchRenamer:
+    """Generates titles for images in a list and renames them.
+
+    Progress is reported through a bus with ``post_status``,
+    ``post_select``, ``post_preview`` and ``post_rename`` methods (the
+    window's ``UIUpdateBus``). The image list and rename lock are shared
+    with the caller, so interactive renames and the batch never rename the
+    same file twice.
+    """
+
+    def __init__(
+        self,
+        file_handler,
+        image_files,
+        scheduler,
+        bus,
+        rename_lock,
+        catalog_dir=CATALOG_DIR,
+    ):
+        """Initialize the renamer.
+
+        Args:
+            file_handler: FileHandler or ArchiveHandler for the images
+            image_files: Filenames in list order, updated as files are renamed
+            scheduler: JobScheduler that runs inference jobs
+            bus: Receiver for progress updates
+            rename_lock: Lock guarding renames and ``image_files``
+            catalog_dir: Directory that holds catalog databases
+        """
+        self.file_handler = file_handler
+        self.image_files = image_files
+        self.scheduler = scheduler
+        self.bus = bus
+        self.rename_lock = rename_lock
+        self.catalog_dir = catalog_dir
+
+        self.renamed_count = 0
+        self.failed_count = 0
+        self.cancelled = False
+
+    def open_catalog(self):
+        """Open the catalog for the current directory.
+
+        Returns:
+            ImageCatalog: The catalog; close it when done
+        """
+        return ImageCatalog(self.file_handler.directory, self.catalog_dir)
+
+    def run(self, ai_service, model_name, cancel_event, only_new=False):
+        """Process all images (runs in a worker thread).
+
+        Args:
+            ai_service: The OllamaService to generate titles with
+            model_name: Model label recorded in the catalog
+            cancel_event: Event set to cancel the batch
+            only_new: Only process files that are new or modified since
+                they were last recorded in the directory catalog
+
+        Returns:
+            bool: False if the batch was aborted because the model cannot
+            analyze images, True otherwise (including when cancelled)
+        """
+        bus = self.bus
+        catalog = None
+        readahead = None
+        refusals = 0
+        stopped = False
+
+        try:
+            catalog = self.open_catalog()
+
+            # Refuse to start with a model known to be text-only
+            if not ai_service.supports_vision():
+                return False
+
+            # Work out which images need processing
+            indices = list(range(len(self.image_files)))
+            if only_new:
+                changed = set(catalog.changed_files(self.file_handler.scan_images()))
+                indices = [i for i in indices if self.image_files[i] in changed]
+            total_images = len(indices)
+
+            # On network shares, read files ahead of inference
+            if self.file_handler.network_mode:
+                readahead = ReadaheadPool()
+
+            # Keep only a small window of batch jobs queued so interactive
+            # requests can take the next free slot
+            next_position = 0
+            prefetch_position = 0
+            in_flight = deque()
+
+            def fill_window():
+                nonlocal next_position, prefetch_position
+                while readahead is not None and prefetch_position < len(indices):
+                    upcoming = self.image_files[indices[prefetch_position]]
+                    upcoming_path = self.file_handler.get_file_path(upcoming)
+                    if not readahead.prefetch(upcoming_path):
+                        break
+                    prefetch_position += 1
+
+                while len(in_flight) < BULK_WINDOW and next_position < len(indices):
+                    next_index = indices[next_position]
+                    next_position += 1
+                    next_filename = self.image_files[next_index]
+                    future = self.scheduler.submit(
+                        self.generate_title_job,
+                        ai_service,
+                        self.file_handler.get_file_path(next_filename),
+                        readahead,
+                        lane=BULK,
+                    )
+                    in_flight.append((next_index, next_filename, future))
+
+            fill_window()
+            position = 0
+
+            while in_flight:
+                index, filename, future = in_flight.popleft()
+                position += 1
+
+                if cancel_event.is_set():
+                    self.cancelled = True
+                    break
+
+                try:
+                    # Update status, selection and preview text
+                    bus.post_status(f"Processing {position}/{total_images}...")
+                    bus.post_select(index)
+                    bus.post_preview(f"Analyzing: {filename}\n⏳ Generating name...")
+
+                    # Wait for the AI-generated title
+                    new_title, content_hash = future.result()
+
+                    # Show generated name in preview box
+                    bus.post_preview(f"✓ Generated: {new_title}")
+
+                    # Rename the file unless an interactive request got there first
+                    new_filename = self.apply_rename(index, filename, new_title)
+                    if new_filename is None:
+                        continue
+
+                    self.record_rename(
+                        catalog, new_filename, model_name, new_title, content_hash
+                    )
+                    self.renamed_count += 1
+                    refusals = 0
+
+                except RequestCancelledError:
+                    # The in-flight image is left untouched
+                    self.cancelled = True
+                    break
+
+                except VisionNotSupportedError as e:
+                    # Every remaining image would fail the same way - stop now
+                    print(f"Aborting batch: {str(e)}")
+                    stopped = True
+                    return False
+
+                except ModelRefusalError as e:
+                    print(f"Error processing {filename}: {str(e)}")
+                    bus.post_preview(f"❌ Error: {str(e)}")
+                    self.failed_count += 1
+                    refusals += 1
+                    if refusals >= REFUSAL_ABORT_LIMIT:
+                        # Metadata didn't say, but the model acts text-only
+                        print(f"Aborting batch after {refusals} refusals in a row")
+                        stopped = True
+                        return False
+
+                except Exception as e:
+                    if self.image_files[index] != filename:
+                        # Renamed by an interactive request while queued
+                        continue
+                    error_msg = str(e)
+                    print(f"Error processing {filename}: {error_msg}")
+                    bus.post_preview(f"❌ Error: {error_msg}")
+                    self.failed_count += 1
+
+                finally:
+                    # Only top up the window while the batch keeps going
+                    if not (stopped or self.cancelled or cancel_event.is_set()):
+                        fill_window()
+
+            return True
+
+        finally:
+            # Drop any batch work still queued
+            self.scheduler.cancel(BULK)
+            if readahead is not None:
+                readahead.close()
+            if catalog is not None:
+                catalog.close()
+
+    def apply_rename(self, index, filename, new_title):
+        """Rename a file and update the image list (runs in worker threads).
+
+        Args:
+            index: Index of the image in the list
+            filename: Filename the title was generated for
+            new_title: New title (without extension)
+
+        Returns:
+            str | None: The new filename, or None if the image was already
+            renamed by another request
+        """
+        with self.rename_lock:
+            if self.image_files[index] != filename:
+                return None
+
+            new_filename = self.file_handler.rename_image(filename, new_title)
+            self.image_files[index] = new_filename
+
+        # Queue the listbox update with the new name
+        self.bus.post_rename(index, new_filename)
+        return new_filename
+
+    @staticmethod
+    def generate_title_job(ai_service, filepath, readahead=None):
+        """Generate a title, using read-ahead data when available.
+
+        Runs in a scheduler slot.
+
+        Args:
+            ai_service: The OllamaService to use
+            filepath: Path to the image file
+            readahead: Optional ReadaheadPool holding the file contents
+
+        Returns:
+            tuple: (title, content_hash), where content_hash is None if the
+            file was not read here
+        """
+        if readahead is not None:
+            image_data = readahead.take(filepath)
+        elif hasattr(filepath, "read_bytes"):
+            # Archive member: read once for both inference and the catalog
+            image_data = filepath.read_bytes()
+        else:
+            return ai_service.generate_title(filepath), None
+
+        title = ai_service.generate_title(filepath, image_data)
+        return title, ImageCatalog.hash_bytes(image_data)
+
+    def record_rename(self, catalog, filename, model_name, title, content_hash=None):
+        """Record a renamed file in the directory catalog.
+
+        Args:
+            catalog: The open ImageCatalog for the current directory
+            filename: The file's new name
+            model_name: The model that generated the title
+            title: The generated title
+            content_hash: Content hash if already known (avoids re-reading)
+        """
+        try:
+            if content_hash is None:
+                content_hash = ImageCatalog.hash_file(
+                    self.file_handler.get_file_path(filename)
+                )
+            catalog.record(
+                filename,
+                self.file_handler.get_signature(filename),
+                content_hash=content_hash,
+                model=model_name,
+                title=title,
+            )
+        except Exception as e:
+            print(f"Error updating catalog for {filename}: {str(e)}")
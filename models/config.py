@@ -1,5 +1,7 @@
 """Configuration constants for the Image Viewer application."""
 
+import os
+
 # Window settings
 WINDOW_TITLE = "Image Viewer"
 WINDOW_GEOMETRY = "1000x700"
@@ -25,3 +27,81 @@ DEFAULT_DISPLAY_SIZE = 600
 # AI settings
 DEFAULT_OLLAMA_MODEL = "lava"  # Fallback vision model
 MAX_TITLE_LENGTH = 30
+# Consecutive refused images after which a batch assumes the model is
+# text-only (vision models also refuse the odd blank or placeholder image)
+REFUSAL_ABORT_LIMIT = 5
+
+# Cache settings
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "image_renaming_ai")
+MODEL_REGISTRY_FILE = os.path.join(CACHE_DIR, "model_registry.json")
+CATALOG_DIR = os.path.join(CACHE_DIR, "catalogs")
+
+# Known vision-capable model identifiers, used only when Ollama does not
+# report model capabilities
+VISION_MODEL_HINTS = (
+    "llama3.2-vision",
+    "llama4",  # Llama 4 models are multimodal
+    "llava",
+    "bakllava",
+    "qwen2-vl",
+    "qwen-vl",
+    "mistral-small",  # Mistral Small 3.1 has vision
+    "pixtral",  # Mistral's vision model
+    "moondream",
+    "cogvlm",
+)
+
+# UI update settings
+UI_REFRESH_INTERVAL_MS = 50  # Drain worker updates at ~20 frames per second
+PREVIEW_SKIP_RATE = 2.0  # Skip image previews above this many images/second
+THROUGHPUT_WINDOW_SECONDS = 5.0
+
+# Inference backend settings
+INFERENCE_BACKEND = "ollama"  # "ollama" or "openai" (llama.cpp server, vLLM, ...)
+OPENAI_HOSTS = ()  # OpenAI-compatible base URLs, e.g. ("http://localhost:8000/v1",)
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
+HTTP_POOL_SIZE = 8  # Pooled keep-alive connections per OpenAI-compatible endpoint
+RESPONSE_MAX_TOKENS = 32  # Titles are short; a cap frees server slots sooner
+
+# Request deadline and hedging settings
+OLLAMA_HOSTS = ()  # Extra Ollama endpoints for hedged requests; empty = default host
+REQUEST_TIMEOUT = 120.0  # Seconds before a single title request is abandoned
+HEDGE_PERCENTILE = None  # e.g. 95 to hedge requests slower than the p95 latency
+HEDGE_MIN_SAMPLES = 10  # Latencies needed before hedging kicks in
+
+# Preview rendering settings
+PREVIEW_REFINE_DELAY_MS = 150  # Wait before the high-quality preview pass
+PREVIEW_SOURCE_SCALE = 2  # Refine pass decodes at most this many times the display
+PREVIEW_DECODE_POLL_MS = 20  # How often the Tk thread checks for a finished decode
+RESIZE_DEBOUNCE_MS = 100  # Wait for window resizing to settle before re-rendering
+CANCEL_POLL_SECONDS = 0.1  # How often waiting requests check for cancellation
+
+# Job scheduling settings
+INFERENCE_SLOTS = 1  # Concurrent AI requests (match OLLAMA_NUM_PARALLEL)
+BULK_WINDOW = 2  # Batch jobs queued ahead so interactive jobs can cut in
+QUEUE_STATS_INTERVAL_MS = 500
+
+# Search settings
+SEARCH_DEBOUNCE_MS = 150  # Wait for typing to pause before filtering
+SEARCH_RESULT_LIMIT = 5000  # Maximum rows shown for a filtered view
+
+# Network filesystem settings
+NETWORK_IO_MODE = False  # Trust one scandir snapshot and read files ahead
+READAHEAD_WORKERS = 4  # Concurrent background reads
+READAHEAD_DEPTH = 8  # Files buffered ahead of inference
+
+# Archive settings
+ARCHIVE_MAX_MEMBER_MB = 200  # Larger archive members are skipped
+
+# Distributed mode settings
+JOB_QUEUE_PATH = os.path.join(CACHE_DIR, "job_queue.sqlite3")  # Or a shared volume
+JOB_LEASE_SECONDS = 30.0  # Jobs of a silent worker are reassigned after this
+JOB_MAX_ATTEMPTS = 3  # Leases a job gets before it is marked failed
+QUEUE_POLL_SECONDS = 1.0  # How often idle workers and the coordinator poll
+
+# Inference payload settings
+PAYLOAD_MAX_SIZE = 1120  # Longest side sent to the model; larger images are shrunk
+PAYLOAD_JPEG_QUALITY = 90  # Quality of re-encoded payloads
+PAYLOAD_CACHE_DIR = os.path.join(CACHE_DIR, "payloads")
+PAYLOAD_CACHE_MEMORY_MB = 256  # In-memory tier of encoded payloads
+PAYLOAD_CACHE_DISK_MB = 2048  # On-disk tier; 0 disables it
@@ -0,0 +1,336 @@
+"""Coordinator and worker roles for renaming across several machines."""
+
+import os
+import socket
+import threading
+import uuid
+
+from models.ai_service import (
+    OllamaService,
+    RequestCancelledError,
+    VisionNotSupportedError,
+)
+from models.config import (
+    MAX_TITLE_LENGTH,
+    JOB_LEASE_SECONDS,
+    QUEUE_POLL_SECONDS,
+)
+from utils.catalog import ImageCatalog
+from utils.file_handler import FileHandler
+from utils.job_queue import DONE, FAILED, LEASED, PENDING
+from utils.payload_cache import PayloadCache
+
+
+class Coordinator:
+    """Publishes rename jobs and applies the titles workers report.
+
+    The coordinator is the only process that renames files, so collision
+    handling works exactly as in the desktop app no matter how many
+    workers generate titles.
+    """
+
+    def __init__(self, queue, model_name, poll_seconds=QUEUE_POLL_SECONDS):
+        """Initialize the coordinator.
+
+        Args:
+            queue: A JobQueue or RemoteJobQueue
+            model_name: Model combobox label workers should use
+            poll_seconds: How often to check for finished jobs
+        """
+        self.queue = queue
+        self.model_name = model_name
+        self.poll_seconds = poll_seconds
+        self.stop_event = threading.Event()
+
+    def _collect(self, directories, only_new):
+        """Find the images to process.
+
+        Args:
+            directories: Image directories to scan
+            only_new: Skip files already recorded in each directory catalog
+
+        Returns:
+            dict: Mapping of image path to (FileHandler, filename)
+        """
+        jobs = {}
+        for directory in directories:
+            file_handler = FileHandler(os.path.abspath(directory))
+            filenames = file_handler.get_image_files()
+            if only_new:
+                with ImageCatalog(file_handler.directory) as catalog:
+                    changed = set(catalog.changed_files(file_handler.scan_images()))
+                filenames = [name for name in filenames if name in changed]
+            for filename in filenames:
+                jobs[file_handler.get_file_path(filename)] = (file_handler, filename)
+        return jobs
+
+    @staticmethod
+    def _safe_title(title):
+        """Re-sanitize a title reported by a worker.
+
+        Workers (or anyone who can reach a served queue) may report any
+        string, so titles are never trusted to be plain file names.
+
+        Args:
+            title: Title from the finished job
+
+        Returns:
+            str | None: Sanitized, truncated title, or None to reject it
+        """
+        if not isinstance(title, str) or ".." in title:
+            return None
+        if os.sep in title or (os.altsep and os.altsep in title):
+            return None
+        return OllamaService._sanitize_title(title)[:MAX_TITLE_LENGTH] or None
+
+    def _apply(self, job, title, jobs, catalogs):
+        """Rename the file for a finished job.
+
+        Args:
+            job: Finished job with path
+            title: Sanitized title to apply
+            jobs: Mapping of image path to (FileHandler, filename)
+            catalogs: Open ImageCatalog per directory
+
+        Returns:
+            bool: True if the file was renamed
+        """
+        file_handler, filename = jobs[job["path"]]
+        try:
+            new_filename = file_handler.rename_image(filename, title)
+        except Exception as e:
+            print(f"Error renaming {filename}: {str(e)}")
+            return False
+
+        catalog = catalogs.get(file_handler.directory)
+        if catalog is None:
+            catalog = catalogs[file_handler.directory] = ImageCatalog(
+                file_handler.directory
+            )
+        try:
+            catalog.record(
+                new_filename,
+                file_handler.get_signature(new_filename),
+                content_hash=ImageCatalog.hash_file(
+                    file_handler.get_file_path(new_filename)
+                ),
+                model=self.model_name,
+                title=title,
+            )
+        except Exception as e:
+            print(f"Error updating catalog for {new_filename}: {str(e)}")
+        return True
+
+    def run(self, directories, only_new=False):
+        """Publish a batch and apply titles until every job is finished.
+
+        Args:
+            directories: Image directories to process
+            only_new: Skip files already recorded in each directory catalog
+
+        Returns:
+            dict: Counts of renamed, failed and reassigned jobs
+        """
+        jobs = self._collect(directories, only_new)
+        batch = uuid.uuid4().hex
+        self.queue.publish(batch, self.model_name, list(jobs))
+        print(f"Published {len(jobs)} job(s) as batch {batch}")
+
+        catalogs = {}
+        renamed = 0
+        try:
+            while True:
+                # Don't rely on workers alone to notice dead workers' leases
+                self.queue.reclaim_expired()
+
+                finished = self.queue.finished(batch)
+                applied = []
+                for job in finished:
+                    title = self._safe_title(job["title"])
+                    if title is None:
+                        print(f"Rejecting unsafe title for {job['path']}")
+                        self.queue.reject(job["id"], "Unsafe title")
+                        continue
+                    renamed += self._apply(job, title, jobs, catalogs)
+                    applied.append(job["id"])
+                if applied:
+                    self.queue.mark_applied(applied)
+
+                counts = self.queue.counts(batch)
+                unfinished = counts.get(PENDING, 0) + counts.get(LEASED, 0)
+                if not unfinished and not counts.get(DONE):
+                    break
+                if finished:
+                    print(f"Renamed {renamed}/{len(jobs)}, {unfinished} unfinished")
+                if self.stop_event.wait(self.poll_seconds):
+                    self.queue.abort(batch, "Coordinator stopped")
+                    break
+        finally:
+            for catalog in catalogs.values():
+                catalog.close()
+
+        return {
+            "renamed": renamed,
+            "failed": self.queue.counts(batch).get(FAILED, 0),
+            "reassigned": self.queue.reassigned(batch),
+        }
+
+    def stop(self):
+        """Stop waiting and abort the batch's unfinished jobs."""
+        self.stop_event.set()
+
+
+class Worker:
+    """Leases jobs from the queue and reports generated titles.
+
+    A background thread renews the lease while a title is being
+    generated, so only workers that die or hang lose their jobs.
+    """
+
+    def __init__(
+        self,
+        queue,
+        worker_id=None,
+        hosts=None,
+        lease_seconds=JOB_LEASE_SECONDS,
+        poll_seconds=QUEUE_POLL_SECONDS,
+        path_map=None,
+    ):
+        """Initialize the worker.
+
+        Args:
+            queue: A JobQueue or RemoteJobQueue
+            worker_id: Identifier reported to the queue; defaults to host:pid
+            hosts: Inference endpoints; None uses the configured hosts
+            lease_seconds: Lease length; renewed at a third of this interval
+            poll_seconds: How long to wait when the queue is empty
+            path_map: Optional (coordinator_prefix, local_prefix) for hosts
+                that mount the shared images at a different path
+        """
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.hosts = hosts
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.path_map = path_map
+        self.stop_event = threading.Event()
+        self._services = {}
+        self._payload_cache = PayloadCache()
+
+    def _local_path(self, path):
+        """Translate a coordinator path to this host's mount point.
+
+        Args:
+            path: Image path as seen by the coordinator
+
+        Returns:
+            str: Image path on this host
+        """
+        if self.path_map is not None:
+            remote_prefix, local_prefix = self.path_map
+            if path.startswith(remote_prefix):
+                return local_prefix + path[len(remote_prefix) :]
+        return path
+
+    def _service(self, model_name):
+        """Get (or create) the inference service for a model.
+
+        Args:
+            model_name: Model combobox label from the job
+
+        Returns:
+            OllamaService: Service shared by jobs using the model
+        """
+        if model_name not in self._services:
+            self._services[model_name] = OllamaService.from_model_choice(
+                model_name,
+                MAX_TITLE_LENGTH,
+                hosts=self.hosts,
+                cancel_event=self.stop_event,
+                payload_cache=self._payload_cache,
+            )
+        return self._services[model_name]
+
+    def _keep_lease(self, job_id, done):
+        """Renew a lease until the job is done (runs in a thread).
+
+        Args:
+            job_id: The leased job
+            done: Event set once the job is finished
+        """
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                if not self.queue.renew(job_id, self.worker_id, self.lease_seconds):
+                    return
+            except Exception as e:
+                print(f"Could not renew lease for job {job_id}: {str(e)}")
+
+    def process(self, job):
+        """Generate and report the title for one job.
+
+        Args:
+            job: Leased job with id, batch, path and model
+
+        Returns:
+            bool: False if the worker should stop taking jobs
+        """
+        done = threading.Event()
+        threading.Thread(
+            target=self._keep_lease, args=(job["id"], done), daemon=True
+        ).start()
+
+        try:
+            service = self._service(job["model"])
+            title = service.generate_title(self._local_path(job["path"]))
+            if not self.queue.complete(job["id"], self.worker_id, title):
+                print(f"Job {job['id']} was reassigned; discarding its title")
+            return True
+
+        except RequestCancelledError:
+            self.queue.release(job["id"], self.worker_id)
+            return False
+
+        except VisionNotSupportedError as e:
+            # Every job in the batch would fail the same way
+            self.queue.abort(job["batch"], str(e))
+            print(f"Aborting batch: {str(e)}")
+            return True
+
+        except Exception as e:
+            print(f"Error processing {job['path']}: {str(e)}")
+            self.queue.fail(job["id"], self.worker_id, str(e))
+            return True
+
+        finally:
+            done.set()
+
+    def run(self, exit_when_idle=False):
+        """Process jobs until stopped.
+
+        Args:
+            exit_when_idle: Return once no jobs are pending or leased
+
+        Returns:
+            int: Number of jobs processed
+        """
+        processed = 0
+        try:
+            while not self.stop_event.is_set():
+                job = self.queue.lease(self.worker_id, self.lease_seconds)
+                if job is None:
+                    # Stay while other workers hold leases that may expire
+                    if exit_when_idle and not self.queue.counts().get(LEASED):
+                        break
+                    self.stop_event.wait(self.poll_seconds)
+                    continue
+                if not self.process(job):
+                    break
+                processed += 1
+        finally:
+            for service in self._services.values():
+                service.close()
+        return processed
+
+    def stop(self):
+        """Stop after (or abort) the current job."""
+        self.stop_event.set()
@@ -0,0 +1,363 @@
+"""Model servers that stream chat completions for title generation."""
+
+import abc
+import base64
+import json
+
+import httpx
+from ollama import Client
+
+from models.config import (
+    INFERENCE_BACKEND,
+    OLLAMA_HOSTS,
+    OPENAI_HOSTS,
+    OPENAI_API_KEY,
+    RESPONSE_MAX_TOKENS,
+    HTTP_POOL_SIZE,
+    REQUEST_TIMEOUT,
+)
+from models.model_registry import ModelRegistry
+
+OLLAMA = "ollama"
+OPENAI = "openai"
+BACKENDS = (OLLAMA, OPENAI)
+
+DEFAULT_OPENAI_HOST = "http://localhost:8080/v1"  # llama.cpp server default
+
+# Leading bytes of supported image formats, for data URL MIME types
+IMAGE_SIGNATURES = (
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+)
+
+
+def _image_mime(image_base64):
+    """Guess the MIME type of a base64-encoded image from its header.
+
+    Args:
+        image_base64: Base64-encoded image data
+
+    Returns:
+        str: MIME type, ``image/jpeg`` if the format is not recognised
+    """
+    header = base64.b64decode(image_base64[:16])
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mime in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return mime
+    return "image/jpeg"
+
+
+class InferenceBackend(abc.ABC):
+    """Interface to a model server used by ``OllamaService``.
+
+    Messages use Ollama's chat format: dicts with ``role``, ``content`` and
+    an optional ``images`` list of base64 strings. Backends translate them
+    to their server's wire format.
+    """
+
+    name = None
+
+    @abc.abstractmethod
+    def stream_chat(self, model, messages):
+        """Stream a chat completion.
+
+        Closing the returned generator must close the underlying response
+        so the server stops generating.
+
+        Args:
+            model: Model name on the server
+            messages: Chat messages in Ollama format
+
+        Yields:
+            tuple[str, bool]: (text fragment, whether generation finished)
+        """
+
+    @abc.abstractmethod
+    def list_models(self):
+        """Get models on the server that can analyze images.
+
+        Returns:
+            list[str]: Model names
+        """
+
+    def supports_vision(self, model):
+        """Check whether a model is known to accept images.
+
+        Args:
+            model: Model name on the server
+
+        Returns:
+            bool: False only if the model is known to be text-only
+        """
+        return True
+
+    def confirms_non_vision(self, model):
+        """Check whether metadata confirms a model cannot analyze images.
+
+        Args:
+            model: Model name on the server
+
+        Returns:
+            bool: True only if the server reports the model as text-only
+        """
+        return False
+
+    def close(self):
+        """Release connections held by the backend."""
+
+
+class OllamaBackend(InferenceBackend):
+    """Ollama's native chat API via the ``ollama`` client."""
+
+    name = OLLAMA
+
+    def __init__(self, host=None, timeout=REQUEST_TIMEOUT):
+        """Initialize the backend.
+
+        Args:
+            host: Ollama endpoint, or None for the default host
+            timeout: HTTP timeout in seconds
+        """
+        self._client = Client(host=host, timeout=timeout)
+        self._registry = ModelRegistry(client=self._client)
+
+    def stream_chat(self, model, messages):
+        """Stream a chat completion from Ollama."""
+        stream = self._client.chat(
+            model=model,
+            messages=messages,
+            stream=True,
+            options={"num_predict": RESPONSE_MAX_TOKENS},
+        )
+        try:
+            for chunk in stream:
+                yield chunk["message"]["content"], chunk.get("done", False)
+        finally:
+            # Closing the generator closes the HTTP response, which stops
+            # Ollama from generating the rest of the completion
+            stream.close()
+
+    def list_models(self):
+        """Get installed vision models from the cached model registry."""
+        return self._registry.vision_models()
+
+    def supports_vision(self, model):
+        """Check the model registry for vision support."""
+        return self._registry.supports_vision(model)
+
+    def confirms_non_vision(self, model):
+        """Check the model registry's reported capabilities."""
+        return self._registry.confirms_non_vision(model)
+
+    def close(self):
+        """Close the client's connection pool."""
+        # Older ollama clients have no close(); their pool is freed on GC
+        close = getattr(self._client, "close", None)
+        if close is not None:
+            close()
+
+
+class OpenAIBackend(InferenceBackend):
+    """OpenAI-compatible chat completions (llama.cpp server, vLLM, ...).
+
+    Images are sent as ``image_url`` content parts with data URLs.
+    Requests share one pooled HTTP client, so concurrent requests to
+    servers with parallel slots or continuous batching reuse keep-alive
+    connections instead of reconnecting for every image. Responses cut
+    off after the title close their connection to stop generation.
+    """
+
+    name = OPENAI
+
+    def __init__(
+        self,
+        host=None,
+        timeout=REQUEST_TIMEOUT,
+        api_key=OPENAI_API_KEY,
+        pool_size=HTTP_POOL_SIZE,
+    ):
+        """Initialize the backend.
+
+        Args:
+            host: Base URL including the API version, e.g.
+                ``http://localhost:8000/v1``; None for the llama.cpp default
+            timeout: HTTP timeout in seconds
+            api_key: Bearer token, if the server requires one
+            pool_size: Maximum pooled connections to the server
+        """
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.Client(
+            base_url=host or DEFAULT_OPENAI_HOST,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+
+    @staticmethod
+    def _convert_message(message):
+        """Convert an Ollama-format message to the OpenAI format.
+
+        Args:
+            message: Message dict with optional ``images``
+
+        Returns:
+            dict: Message with text and image content parts
+        """
+        images = message.get("images")
+        if not images:
+            return {"role": message["role"], "content": message["content"]}
+
+        parts = [{"type": "text", "text": message["content"]}]
+        for image in images:
+            parts.append(
+                {
+                    "type": "image_url",
+                    "image_url": {"url": f"data:{_image_mime(image)};base64,{image}"},
+                }
+            )
+        return {"role": message["role"], "content": parts}
+
+    def stream_chat(self, model, messages):
+        """Stream a chat completion over server-sent events."""
+        payload = {
+            "model": model,
+            "messages": [self._convert_message(message) for message in messages],
+            "stream": True,
+            # No server-side stop on newlines: a reply may start with one,
+            # and _stream_chat skips leading blank lines before the title
+            "max_tokens": RESPONSE_MAX_TOKENS,
+        }
+        # Leaving the with-block early closes the connection, which aborts
+        # generation on the server
+        with self._client.stream("POST", "chat/completions", json=payload) as response:
+            if response.is_error:
+                response.read()
+                raise RuntimeError(
+                    f"Server returned {response.status_code}: {response.text[:200]}"
+                )
+
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    # Keep reading to the end of the body so the
+                    # connection can be reused
+                    continue
+
+                choices = json.loads(data).get("choices") or []
+                if not choices:
+                    continue
+                delta = choices[0].get("delta") or {}
+                finished = choices[0].get("finish_reason") is not None
+                yield delta.get("content") or "", finished
+
+    def list_models(self):
+        """Get the models served by the server.
+
+        OpenAI-compatible servers do not report capabilities, so every
+        served model is listed.
+        """
+        response = self._client.get("models")
+        response.raise_for_status()
+        return [model["id"] for model in response.json().get("data", [])]
+
+    def close(self):
+        """Close the connection pool."""
+        self._client.close()
+
+
+BACKEND_CLASSES = {OLLAMA: OllamaBackend, OPENAI: OpenAIBackend}
+
+
+def default_hosts(backend):
+    """Get the configured endpoints for a backend.
+
+    Args:
+        backend: Backend name
+
+    Returns:
+        tuple: Endpoints; empty means the backend's default host
+    """
+    return OPENAI_HOSTS if backend == OPENAI else OLLAMA_HOSTS
+
+
+def create_backend(backend, host=None, timeout=REQUEST_TIMEOUT):
+    """Create a backend for one endpoint.
+
+    Args:
+        backend: Backend name, one of ``BACKENDS``
+        host: Endpoint, or None for the backend's default
+        timeout: HTTP timeout in seconds
+
+    Returns:
+        InferenceBackend: The backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend not in BACKEND_CLASSES:
+        raise ValueError(
+            f"Unknown inference backend '{backend}' (expected one of {BACKENDS})"
+        )
+    return BACKEND_CLASSES[backend](host=host, timeout=timeout)
+
+
+def model_choice(backend, model):
+    """Build the model combobox label for a backend's model.
+
+    Models on the configured default backend are shown unprefixed.
+
+    Args:
+        backend: Backend name
+        model: Model name on that backend
+
+    Returns:
+        str: Label such as ``openai:qwen2-vl-7b``
+    """
+    if backend == INFERENCE_BACKEND:
+        return model
+    return f"{backend}:{model}"
+
+
+def parse_model_choice(choice):
+    """Split a model combobox label into backend and model name.
+
+    Args:
+        choice: Label built by ``model_choice``
+
+    Returns:
+        tuple[str, str]: (backend, model)
+    """
+    for backend in BACKENDS:
+        prefix = f"{backend}:"
+        if backend != INFERENCE_BACKEND and choice.startswith(prefix):
+            return backend, choice[len(prefix) :]
+    return INFERENCE_BACKEND, choice
+
+
+def enabled_backends():
+    """Get the backends whose models should be offered.
+
+    The default backend is always enabled; others are enabled when they
+    have endpoints configured. Ollama is always tried since it has a
+    well-known local default.
+
+    Returns:
+        list[str]: Backend names, default first
+    """
+    others = [
+        backend
+        for backend in BACKENDS
+        if backend != INFERENCE_BACKEND
+        and (backend == OLLAMA or default_hosts(backend))
+    ]
+    return [INFERENCE_BACKEND] + others
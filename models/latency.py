@@ -0,0 +1,142 @@
+"""Latency tracking for AI requests."""
+
+import threading
+
+from models.config import RESPONSE_MAX_TOKENS
+
+
+class LatencyTracker:
+    """Records request latencies and hedging counters.
+
+    Latencies are kept in a bounded window so percentiles follow the
+    current model and load rather than the whole session.
+    """
+
+    def __init__(self, window=500, max_chunks=RESPONSE_MAX_TOKENS):
+        """Initialize the tracker.
+
+        Args:
+            window: Maximum number of recent latencies to keep
+            max_chunks: Longest response the server may generate, in
+                streamed chunks (one token each)
+        """
+        self.window = window
+        self.max_chunks = max_chunks
+        self._lock = threading.Lock()
+        self._samples = []
+        self._first_token = []
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self.cutoffs = 0
+        self.saved_seconds = 0.0
+
+    def record(self, seconds):
+        """Record the latency of a completed request.
+
+        Args:
+            seconds: End-to-end latency in seconds
+        """
+        with self._lock:
+            self.requests += 1
+            self._samples.append(seconds)
+            if len(self._samples) > self.window:
+                del self._samples[0]
+
+    def record_hedge(self, won):
+        """Record that a hedged duplicate request was issued.
+
+        Args:
+            won: Whether the duplicate finished before the original
+        """
+        with self._lock:
+            self.hedges += 1
+            if won:
+                self.hedge_wins += 1
+
+    def record_stream(self, chunks, first_token_seconds, seconds, cut_off):
+        """Record a streamed response and estimate time saved by a cutoff.
+
+        A cut-off response could have run on to the server's token cap, so
+        the saving is estimated as the chunks left before that cap at this
+        response's per-chunk rate. The rate is taken from the chunks after
+        the first, so prompt encoding and prefill don't inflate it. This is
+        an upper bound; responses that finish on their own say nothing
+        about cut-off ones.
+
+        Args:
+            chunks: Number of chunks received
+            first_token_seconds: Time from sending the request to the first
+                chunk, or None if no chunk arrived
+            seconds: Time spent streaming after the first chunk
+            cut_off: Whether reading stopped before the model finished
+        """
+        with self._lock:
+            if first_token_seconds is not None:
+                self._first_token.append(first_token_seconds)
+                if len(self._first_token) > self.window:
+                    del self._first_token[0]
+            if not cut_off or not chunks:
+                return
+            self.cutoffs += 1
+            if chunks > 1:
+                per_chunk = seconds / (chunks - 1)
+                self.saved_seconds += max(0, self.max_chunks - chunks) * per_chunk
+
+    def record_timeout(self):
+        """Record a request that missed its deadline."""
+        with self._lock:
+            self.requests += 1
+            self.timeouts += 1
+
+    def sample_count(self):
+        """Get the number of recorded latencies.
+
+        Returns:
+            int: Number of samples in the window
+        """
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, pct, first_token=False):
+        """Get a latency percentile.
+
+        Args:
+            pct: Percentile between 0 and 100
+            first_token: Use time to first streamed chunk instead of
+                end-to-end latency
+
+        Returns:
+            float | None: Latency in seconds, or None if nothing recorded
+        """
+        with self._lock:
+            samples = self._first_token if first_token else self._samples
+            if not samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self):
+        """Get a one-line summary of latency and hedging cost.
+
+        Returns:
+            str: Human-readable summary
+        """
+        p50 = self.percentile(50)
+        p99 = self.percentile(99)
+        if p50 is None:
+            return f"no completed requests, timeouts {self.timeouts}"
+
+        extra_load = self.hedges / self.requests * 100 if self.requests else 0.0
+        first_token = self.percentile(50, first_token=True)
+        first_token_text = (
+            f"first token p50 {first_token:.1f}s, " if first_token is not None else ""
+        )
+        return (
+            f"p50 {p50:.1f}s, p99 {p99:.1f}s, {first_token_text}"
+            f"hedges {self.hedges} ({self.hedge_wins} won, +{extra_load:.0f}% load), "
+            f"timeouts {self.timeouts}, "
+            f"early cutoffs {self.cutoffs} (up to ~{self.saved_seconds:.1f}s saved)"
+        )
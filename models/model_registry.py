@@ -0,0 +1,230 @@
+"""Cached registry of Ollama model capabilities."""
+
+import json
+import os
+import threading
+
+import ollama
+
+from models.config import MODEL_REGISTRY_FILE, VISION_MODEL_HINTS
+
+
+class ModelRegistry:
+    """Queries model metadata once and caches it on disk keyed by digest.
+
+    Ollama reports a model's capabilities (``vision``), projector and context
+    information through ``ollama.show``. Those lookups are comparatively slow,
+    so results are persisted to a JSON file and only refreshed when a model's
+    digest changes (i.e. the model was re-pulled or replaced).
+    """
+
+    def __init__(self, cache_path=MODEL_REGISTRY_FILE, client=None):
+        """Initialize the registry.
+
+        Args:
+            cache_path: Path of the JSON file used to persist model metadata
+            client: ``ollama.Client`` for the server to query, or None for
+                the default host
+        """
+        self.cache_path = cache_path
+        self._client = client or ollama
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        """Load cached entries from disk.
+
+        Returns:
+            dict: Mapping of model digest to metadata entry
+        """
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """Persist cached entries to disk (best effort)."""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(self._entries, cache_file, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not save model registry: {str(e)}")
+
+    @staticmethod
+    def _name_suggests_vision(model_name):
+        """Check the model name against known vision model identifiers.
+
+        Only used when the server does not report capabilities.
+
+        Args:
+            model_name: Name of the model
+
+        Returns:
+            bool: True if the name matches a known vision model family
+        """
+        model_lower = model_name.lower()
+        return any(vision_id in model_lower for vision_id in VISION_MODEL_HINTS)
+
+    def _describe(self, model_name, digest):
+        """Query Ollama for a model's metadata.
+
+        Args:
+            model_name: Name of the model
+            digest: Digest of the model, used as the cache key
+
+        Returns:
+            dict: Metadata entry for the model
+        """
+        entry = {
+            "name": model_name,
+            "digest": digest,
+            "vision": None,
+            "capabilities": None,
+            "projector": False,
+            "context_length": None,
+            "parameter_size": None,
+        }
+
+        info = self._client.show(model_name)
+        model_info = info.modelinfo or {}
+
+        if info.details is not None:
+            entry["parameter_size"] = info.details.parameter_size
+
+        for key, value in model_info.items():
+            if key.endswith(".context_length") and isinstance(value, int):
+                entry["context_length"] = value
+            if ".vision." in key or key.startswith("clip."):
+                entry["projector"] = True
+
+        if info.capabilities is not None:
+            entry["capabilities"] = list(info.capabilities)
+            entry["vision"] = "vision" in info.capabilities
+        elif entry["projector"]:
+            entry["vision"] = True
+        else:
+            entry["vision"] = self._name_suggests_vision(model_name)
+
+        return entry
+
+    def get(self, model_name, digest=None):
+        """Get metadata for a model, querying Ollama on a cache miss.
+
+        Args:
+            model_name: Name of the model
+            digest: Digest of the model if already known (avoids a list call)
+
+        Returns:
+            dict | None: Metadata entry, or None if the model is not installed
+        """
+        if digest is None:
+            digest = self._lookup_digest(model_name)
+            if digest is None:
+                return None
+
+        with self._lock:
+            entry = self._entries.get(digest)
+            # Entries cached before capabilities were stored are refreshed
+            if entry is not None and "capabilities" in entry:
+                return dict(entry)
+
+        entry = self._describe(model_name, digest)
+
+        with self._lock:
+            self._entries[digest] = entry
+            self._save()
+        return dict(entry)
+
+    def _lookup_digest(self, model_name):
+        """Find the digest of an installed model.
+
+        Args:
+            model_name: Name of the model
+
+        Returns:
+            str | None: The model digest, or None if not installed
+        """
+        for model in self._client.list().models:
+            if model.model == model_name:
+                return model.digest or model_name
+        return None
+
+    def supports_vision(self, model_name):
+        """Check whether a model is known to accept images.
+
+        Args:
+            model_name: Name of the model
+
+        Returns:
+            bool: False if the model is confirmed text-only, True otherwise
+        """
+        try:
+            entry = self.get(model_name)
+        except Exception:
+            # Metadata unavailable - let inference decide
+            return True
+        if entry is None:
+            return True
+        return bool(entry["vision"])
+
+    @staticmethod
+    def _reports_non_vision(entry):
+        """Check whether the server's capabilities rule out image input.
+
+        Args:
+            entry: Metadata entry
+
+        Returns:
+            bool: True only if capabilities were reported without vision
+        """
+        capabilities = entry.get("capabilities")
+        return capabilities is not None and "vision" not in capabilities
+
+    def confirms_non_vision(self, model_name):
+        """Check whether metadata confirms a model cannot analyze images.
+
+        A refusal to describe one image is not enough: vision models also
+        refuse blank or placeholder images.
+
+        Args:
+            model_name: Name of the model
+
+        Returns:
+            bool: True if the server reports the model as text-only
+        """
+        try:
+            entry = self.get(model_name)
+        except Exception:
+            return False
+        return entry is not None and self._reports_non_vision(entry)
+
+    def vision_models(self):
+        """Get installed models that support image analysis.
+
+        Returns:
+            list[str]: Names of vision-capable models
+        """
+        all_models = self._client.list()
+        if not all_models or not all_models.models:
+            return []
+
+        vision_models = []
+        for model in all_models.models:
+            if model.model is None:
+                continue
+            try:
+                entry = self.get(model.model, model.digest or model.model)
+            except Exception:
+                # Fall back to name matching if metadata cannot be queried
+                if self._name_suggests_vision(model.model):
+                    vision_models.append(model.model)
+                continue
+            if entry["vision"]:
+                vision_models.append(model.model)
+
+        return vision_models
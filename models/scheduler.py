@@ -0,0 +1,128 @@
+"""Priority-aware scheduling of AI inference jobs."""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from models.config import INFERENCE_SLOTS
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)  # Highest priority first
+
+
+class JobScheduler:
+    """Runs inference jobs on a fixed number of slots with priority lanes.
+
+    Each free slot takes the oldest job from the highest-priority non-empty
+    lane, so a single interactive request runs as soon as a slot frees up
+    instead of waiting behind queued batch work.
+    """
+
+    def __init__(self, slots=INFERENCE_SLOTS):
+        """Initialize the scheduler and start its worker threads.
+
+        Args:
+            slots: Number of jobs allowed to run concurrently
+        """
+        self._cond = threading.Condition()
+        self._queues = {lane: deque() for lane in LANES}
+        self._waits = {lane: deque(maxlen=50) for lane in LANES}
+        self._running = {lane: 0 for lane in LANES}
+        self._shutdown = False
+
+        for slot in range(slots):
+            threading.Thread(
+                target=self._worker, name=f"inference-slot-{slot}", daemon=True
+            ).start()
+
+    def submit(self, fn, *args, lane=BULK):
+        """Queue a job.
+
+        Args:
+            fn: Callable to run
+            *args: Arguments for the callable
+            lane: Priority lane, INTERACTIVE or BULK
+
+        Returns:
+            Future: Resolves with the callable's result
+        """
+        future = Future()
+        with self._cond:
+            self._queues[lane].append((future, fn, args, time.monotonic()))
+            self._cond.notify()
+        return future
+
+    def cancel(self, lane):
+        """Cancel every queued (not yet running) job in a lane.
+
+        Args:
+            lane: The lane to clear
+        """
+        with self._cond:
+            for future, _, _, _ in self._queues[lane]:
+                future.cancel()
+            self._queues[lane].clear()
+
+    def shutdown(self):
+        """Stop the workers once queued jobs have drained."""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+
+    def _next_job(self):
+        """Block until a job is available and take it.
+
+        Returns:
+            tuple | None: (lane, job) or None once shut down
+        """
+        with self._cond:
+            while True:
+                for lane in LANES:
+                    if self._queues[lane]:
+                        job = self._queues[lane].popleft()
+                        self._running[lane] += 1
+                        return lane, job
+                if self._shutdown:
+                    return None
+                self._cond.wait()
+
+    def _worker(self):
+        """Run jobs until the scheduler is shut down."""
+        while True:
+            item = self._next_job()
+            if item is None:
+                return
+            lane, (future, fn, args, queued_at) = item
+
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                with self._cond:
+                    self._waits[lane].append(time.monotonic() - queued_at)
+
+                try:
+                    result = fn(*args)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            finally:
+                with self._cond:
+                    self._running[lane] -= 1
+
+    def stats(self):
+        """Get queue depth and recent wait time per lane.
+
+        Returns:
+            dict: Mapping of lane to (queued, running, average_wait_seconds)
+        """
+        with self._cond:
+            stats = {}
+            for lane in LANES:
+                waits = self._waits[lane]
+                average_wait = sum(waits) / len(waits) if waits else 0.0
+                queued = len(self._queues[lane])
+                stats[lane] = (queued, self._running[lane], average_wait)
+            return stats
@@ -1,11 +1,30 @@
 """Image viewer component for displaying images."""
 
+import threading
+
 from PIL import Image, ImageTk
-from models.config import DEFAULT_DISPLAY_SIZE, IMAGE_DISPLAY_PADDING
+from models.config import (
+    DEFAULT_DISPLAY_SIZE,
+    IMAGE_DISPLAY_PADDING,
+    PREVIEW_REFINE_DELAY_MS,
+    PREVIEW_SOURCE_SCALE,
+    PREVIEW_DECODE_POLL_MS,
+    RESIZE_DEBOUNCE_MS,
+)
 
 
 class ImageViewer:
-    """Handles image display operations."""
+    """Handles image display operations.
+
+    Images are shown in two phases: a fast first paint from a reduced
+    decode (``Image.draft``/``reduce``) with a cheap filter, then a
+    high-quality LANCZOS pass once the user has stayed on the image for
+    ``PREVIEW_REFINE_DELAY_MS``. The refine pass decodes in a background
+    thread at most ``PREVIEW_SOURCE_SCALE`` times the display size, so huge
+    images cost neither a decode on the Tk thread nor their full size in
+    memory. That source is kept so window resizes re-render without
+    reopening the file, unless the window grows beyond what it covers.
+    """
 
     def __init__(self, image_label):
         """Initialize the image viewer.
@@ -16,58 +35,298 @@ class ImageViewer:
         self.image_label = image_label
         self.current_image = None
 
+        # Progressive rendering state
+        self._filepath = None
+        self._source = None  # Bounded decode of self._filepath
+        self._source_bound = None  # Largest display size the source covers
+        self._rendered_for = None  # Display size of the last render
+        self._refine_job = None
+        self._resize_job = None
+
+        self.image_label.bind("<Configure>", self._on_resize, add="+")
+
+    @staticmethod
+    def _open(filepath):
+        """Open an image from a path or an archive member.
+
+        Args:
+            filepath: File path, or an object with an ``open`` method
+
+        Returns:
+            Image.Image: The opened (not yet decoded) image
+        """
+        if hasattr(filepath, "open"):
+            return Image.open(filepath.open())
+        return Image.open(filepath)
+
+    def _get_display_size(self):
+        """Get the current size of the display area.
+
+        Returns:
+            tuple[int, int]: Width and height in pixels
+        """
+        display_width = self.image_label.winfo_width()
+        display_height = self.image_label.winfo_height()
+
+        # Use reasonable defaults if window not yet rendered
+        if display_width <= 1:
+            display_width = DEFAULT_DISPLAY_SIZE
+        if display_height <= 1:
+            display_height = DEFAULT_DISPLAY_SIZE
+
+        return display_width, display_height
+
+    @staticmethod
+    def _fit_size(image_size, display_size):
+        """Calculate the preview size maintaining aspect ratio.
+
+        Args:
+            image_size: Original (width, height) of the image
+            display_size: Available (width, height) of the display area
+
+        Returns:
+            tuple[int, int]: Target preview size
+        """
+        img_width, img_height = image_size
+        display_width, display_height = display_size
+        ratio = min(display_width / img_width, display_height / img_height)
+
+        new_width = max(1, int(img_width * ratio * IMAGE_DISPLAY_PADDING))
+        new_height = max(1, int(img_height * ratio * IMAGE_DISPLAY_PADDING))
+        return new_width, new_height
+
+    def _show(self, image, size, resample, display_size):
+        """Resize an image and show it in the label.
+
+        Args:
+            image: The PIL image to render
+            size: Target (width, height)
+            resample: PIL resampling filter
+            display_size: Display area size the render was made for
+        """
+        # reducing_gap lets Pillow shrink by integer factors first, which is
+        # much faster on large images with no visible quality loss
+        try:
+            image = image.resize(size, resample, reducing_gap=3.0)
+        except ValueError:
+            # Some raw modes (e.g. 16-bit TIFF) can't be reduced
+            image = image.resize(size, resample)
+
+        # Convert to PhotoImage and keep a reference to prevent garbage collection
+        photo = ImageTk.PhotoImage(image)
+        self.current_image = photo
+        self._rendered_for = display_size
+
+        # Display image
+        self.image_label.config(image=photo, text="")
+
+    def _covers(self, display_size):
+        """Check whether the kept source is detailed enough for a display size.
+
+        Args:
+            display_size: Display area (width, height)
+
+        Returns:
+            bool: True if the source can be rendered at this size
+        """
+        return (
+            self._source is not None
+            and display_size[0] <= self._source_bound[0]
+            and display_size[1] <= self._source_bound[1]
+        )
+
+    def _cancel_jobs(self):
+        """Cancel any pending refine or resize renders."""
+        for job in (self._refine_job, self._resize_job):
+            if job is not None:
+                self.image_label.after_cancel(job)
+        self._refine_job = None
+        self._resize_job = None
+
+    def _reset(self):
+        """Forget the current image and any pending renders."""
+        self._cancel_jobs()
+        self._filepath = None
+        self._source = None
+        self._source_bound = None
+        self._rendered_for = None
+        self.current_image = None
+
     def display_image(self, filepath):
         """Display an image from the given filepath.
 
+        Shows a fast low-quality render immediately and schedules the
+        high-quality pass.
+
         Args:
-            filepath: Path to the image file to display
+            filepath: Path to the image file to display, or an archive member
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            # Open and resize image to fit the display area
-            image = Image.open(filepath)
-
-            # Get display area size
-            display_width = self.image_label.winfo_width()
-            display_height = self.image_label.winfo_height()
+            self._cancel_jobs()
+            if filepath != self._filepath:
+                self._filepath = filepath
+                self._source = None
 
-            # Use reasonable defaults if window not yet rendered
-            if display_width <= 1:
-                display_width = DEFAULT_DISPLAY_SIZE
-            if display_height <= 1:
-                display_height = DEFAULT_DISPLAY_SIZE
+            display_size = self._get_display_size()
 
-            # Calculate resize ratio maintaining aspect ratio
-            img_width, img_height = image.size
-            ratio = min(display_width / img_width, display_height / img_height)
+            if self._covers(display_size):
+                # Already decoded - just re-render at the new size
+                image = self._source
+                size = self._fit_size(image.size, display_size)
+            else:
+                image = self._open(filepath)
+                size = self._fit_size(image.size, display_size)
 
-            new_width = int(img_width * ratio * IMAGE_DISPLAY_PADDING)
-            new_height = int(img_height * ratio * IMAGE_DISPLAY_PADDING)
+                # Let JPEG decode at a reduced scale (no-op for other formats)
+                image.draft(image.mode, size)
 
-            # Resize image
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                # Cheap integer downscale before the final resize
+                factor = int(min(image.width / size[0], image.height / size[1]))
+                if factor > 1:
+                    try:
+                        image = image.reduce(factor)
+                    except ValueError:
+                        # Palette and some raw modes can't be reduced
+                        pass
 
-            # Convert to PhotoImage
-            photo = ImageTk.PhotoImage(image)
+            self._show(image, size, Image.Resampling.BILINEAR, display_size)
 
-            # Keep a reference to prevent garbage collection
-            self.current_image = photo
-
-            # Display image
-            self.image_label.config(image=photo, text="")
+            self._refine_job = self.image_label.after(
+                PREVIEW_REFINE_DELAY_MS, self._refine
+            )
             return True
 
         except Exception as e:
-            self.image_label.config(text=f"Error loading image: {str(e)}", image="")
-            self.current_image = None
+            self._show_error(e)
             return False
 
+    def _decode_source(self, filepath, bound):
+        """Decode an image at no more than a bounded size (runs in a thread).
+
+        Args:
+            filepath: Path to the image file, or an archive member
+            bound: Largest (width, height) worth decoding
+
+        Returns:
+            tuple: (image, largest display size it can be rendered for)
+        """
+        source = self._open(filepath)
+        full_size = source.size
+        # JPEG decodes straight at a reduced scale; other formats are
+        # decoded in full once and shrunk so only the copy is kept
+        source.draft(source.mode, bound)
+        source.thumbnail(bound, Image.Resampling.LANCZOS)
+        if source.size == full_size:
+            # Nothing was dropped, so every display size is covered
+            return source, (float("inf"), float("inf"))
+        return source, bound
+
+    def _refine(self):
+        """Start the full-quality render of the current image.
+
+        Decoding runs in a background thread; ``_finish_refine`` polls for
+        it on the Tk thread, so large images never stall the event loop.
+        """
+        self._refine_job = None
+        if self._filepath is None:
+            return
+
+        display_size = self._get_display_size()
+        if self._covers(display_size):
+            self._render_source()
+            return
+
+        bound = (
+            display_size[0] * PREVIEW_SOURCE_SCALE,
+            display_size[1] * PREVIEW_SOURCE_SCALE,
+        )
+        result = {}
+
+        def decode():
+            try:
+                result["source"] = self._decode_source(filepath, bound)
+            except Exception as e:
+                result["error"] = e
+
+        filepath = self._filepath
+        thread = threading.Thread(target=decode, daemon=True)
+        thread.start()
+        self._refine_job = self.image_label.after(
+            PREVIEW_DECODE_POLL_MS, self._finish_refine, filepath, thread, result
+        )
+
+    def _finish_refine(self, filepath, thread, result):
+        """Render the decoded source once the background decode is done.
+
+        Args:
+            filepath: Image the decode was started for
+            thread: The decoding thread
+            result: Dict receiving ``source`` or ``error`` from the thread
+        """
+        self._refine_job = None
+        if filepath != self._filepath:
+            return
+        if thread.is_alive():
+            self._refine_job = self.image_label.after(
+                PREVIEW_DECODE_POLL_MS, self._finish_refine, filepath, thread, result
+            )
+            return
+
+        if "error" in result:
+            self._show_error(result["error"])
+            return
+
+        self._source, self._source_bound = result["source"]
+        self._render_source()
+
+    def _render_source(self):
+        """Render the kept source at full quality for the current size."""
+        try:
+            display_size = self._get_display_size()
+            size = self._fit_size(self._source.size, display_size)
+            self._show(self._source, size, Image.Resampling.LANCZOS, display_size)
+        except Exception as e:
+            self._show_error(e)
+
+    def _show_error(self, error):
+        """Forget the current image and show a loading error.
+
+        Args:
+            error: The exception raised while loading
+        """
+        self._reset()
+        self.image_label.config(text=f"Error loading image: {str(error)}", image="")
+
+    def _on_resize(self, event):
+        """Debounce re-rendering when the display area changes size.
+
+        Args:
+            event: The tkinter Configure event
+        """
+        if self._filepath is None or self._rendered_for is None:
+            return
+        if (event.width, event.height) == self._rendered_for:
+            return
+
+        if self._resize_job is not None:
+            self.image_label.after_cancel(self._resize_job)
+        self._resize_job = self.image_label.after(
+            RESIZE_DEBOUNCE_MS, self._rerender
+        )
+
+    def _rerender(self):
+        """Re-render the current image after a resize."""
+        self._resize_job = None
+        if self._filepath is not None:
+            self.display_image(self._filepath)
+
     def clear_image(self):
         """Clear the current image display."""
+        self._reset()
         self.image_label.config(image="", text="No image selected")
-        self.current_image = None
 
     def show_message(self, message):
         """Show a text message in the image display area.
@@ -75,5 +334,5 @@ class ImageViewer:
         Args:
             message: The message to display
         """
+        self._reset()
         self.image_label.config(text=message, image="")
-        self.current_image = None
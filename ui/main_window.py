@@ -11,6 +11,7 @@ from ttkbootstrap.constants import (
     INFO,
     OUTLINE,
     SUCCESS,
+    DANGER,
 )
 from tkinter import filedialog
 import threading
@@ -20,10 +21,21 @@ from models.config import (
     LISTBOX_HEIGHT,
     DEFAULT_OLLAMA_MODEL,
     MAX_TITLE_LENGTH,
+    CATALOG_DIR,
+    QUEUE_STATS_INTERVAL_MS,
+    SEARCH_DEBOUNCE_MS,
+    SEARCH_RESULT_LIMIT,
 )
 from ui.image_viewer import ImageViewer
+from ui.update_bus import UIUpdateBus
+from utils.catalog import ImageCatalog
+from utils.archive_handler import ARCHIVE_EXTENSIONS, ArchiveHandler
 from utils.file_handler import FileHandler
-from models.ai_service import OllamaService
+from utils.payload_cache import PayloadCache
+from utils.search_index import SearchIndex
+from models.ai_service import OllamaService, RequestCancelledError
+from models.batch_renamer import BatchRenamer
+from models.scheduler import INTERACTIVE, JobScheduler
 
 
 class MainWindow:
@@ -38,19 +50,55 @@ class MainWindow:
         self.root = root
         self.file_handler = FileHandler()
         self.image_files: list[str] = []
+
+        # Filtered view: image indices shown in the listbox (None = all)
+        self.search_index = SearchIndex()
+        self.visible_indices: list[int] | None = None
+        self._visible_rows: dict[int, int] = {}
+        self._search_job = None
         self.is_processing = False
+        self.exporting = False
+        # One cancel event per running rename, so cancelling doesn't leak
+        # into renames started afterwards
+        self.cancel_events: set[threading.Event] = set()
+
+        # Inference jobs from the batch and from "AI Rename Selected" share
+        # one scheduler; interactive requests jump ahead of queued batch work
+        self.scheduler = JobScheduler()
+        self.interactive_indices: set[int] = set()
+        self.rename_lock = threading.Lock()
+
+        # Encoded images survive across batches, so re-runs and model
+        # comparisons skip reading and decoding
+        self.payload_cache = PayloadCache()
+        self.catalog_dir = CATALOG_DIR
 
         # UI components - will be initialized in _create_widgets
         self.image_listbox: tk.Listbox
+        self.search_var: tk.StringVar
         self.image_label: ttk.Label
         self.image_viewer: ImageViewer
         self.status_label: ttk.Label
+        self.queue_label: ttk.Label
         self.btn_ai_rename: ttk.Button
+        self.btn_cancel: ttk.Button
+        self.only_new_var: tk.BooleanVar
         self.model_combo: ttk.Combobox
         self.name_preview_text: tk.Text
 
         self._create_widgets()
 
+        # Worker threads push UI state here; drained at a fixed frame rate
+        self.update_bus = UIUpdateBus(
+            root,
+            on_status=lambda text: self.status_label.config(text=text),
+            on_preview=self._update_name_preview,
+            on_select=self._select_image,
+            on_renames=self._update_listbox_items,
+        )
+        self.update_bus.start()
+        self._refresh_queue_stats()
+
     def _create_widgets(self):
         """Create and layout all UI widgets."""
         self._create_button_frame()
@@ -70,6 +118,15 @@ class MainWindow:
         )
         self.btn_select_dir.pack(side=LEFT, padx=5)
 
+        # Open a zip/tar archive as the image source
+        self.btn_open_archive = ttk.Button(
+            button_frame,
+            text="Open Archive",
+            bootstyle=(PRIMARY, OUTLINE),  # type: ignore
+            command=self.select_archive,
+        )
+        self.btn_open_archive.pack(side=LEFT, padx=5)
+
         # Button 2: AI Rename Images
         self.btn_ai_rename = ttk.Button(
             button_frame,
@@ -88,6 +145,35 @@ class MainWindow:
         )
         self.btn3.pack(side=LEFT, padx=5)
 
+        # Button 4: Cancel the running rename
+        self.btn_cancel = ttk.Button(
+            button_frame,
+            text="Cancel",
+            bootstyle=(DANGER, OUTLINE),  # type: ignore
+            command=self.cancel_processing,
+            state="disabled",
+        )
+        self.btn_cancel.pack(side=LEFT, padx=5)
+
+        # Write renames made inside an archive
+        self.btn_export = ttk.Button(
+            button_frame,
+            text="Export Renames",
+            bootstyle=(SUCCESS, OUTLINE),  # type: ignore
+            command=self.export_archive_renames,
+            state="disabled",
+        )
+        self.btn_export.pack(side=LEFT, padx=5)
+
+        # Only process files not yet recorded in the directory catalog
+        self.only_new_var = tk.BooleanVar(value=False)
+        self.chk_only_new = ttk.Checkbutton(
+            button_frame,
+            text="Only new files",
+            variable=self.only_new_var,
+        )
+        self.chk_only_new.pack(side=LEFT, padx=5)
+
         # Model selection dropdown
         ttk.Label(button_frame, text="Model:", font=("Helvetica", 10)).pack(
             side=LEFT, padx=(20, 5)
@@ -130,6 +216,16 @@ class MainWindow:
             anchor=tk.W
         )
 
+        # Search box filtering the list by filename or AI title
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(left_frame, textvariable=self.search_var)
+        search_entry.pack(side=TOP, fill=tk.X, pady=(0, 5))
+        self.search_var.trace_add("write", self._on_search_changed)
+
+        # Queue depth and wait time per scheduler lane
+        self.queue_label = ttk.Label(left_frame, text="", font=("Helvetica", 9))
+        self.queue_label.pack(side=tk.BOTTOM, anchor=tk.W, pady=(5, 0))
+
         # Listbox with scrollbar
         list_scroll = ttk.Scrollbar(left_frame)
         list_scroll.pack(side=RIGHT, fill=tk.Y)
@@ -191,8 +287,18 @@ class MainWindow:
         # Initialize image viewer
         self.image_viewer = ImageViewer(self.image_label)
 
+    def _refresh_queue_stats(self):
+        """Show queue depth and average wait for each scheduler lane."""
+        parts = []
+        for lane, (queued, running, wait) in self.scheduler.stats().items():
+            parts.append(
+                f"{lane}: {queued} queued, {running} running, {wait:.1f}s wait"
+            )
+        self.queue_label.config(text="\n".join(parts))
+        self.root.after(QUEUE_STATS_INTERVAL_MS, self._refresh_queue_stats)
+
     def _load_available_models(self):
-        """Load available vision-capable Ollama models into the dropdown."""
+        """Load vision-capable models from every backend into the dropdown."""
         models = OllamaService.get_available_models()
 
         if models:
@@ -218,23 +324,112 @@ class MainWindow:
         directory = filedialog.askdirectory(title="Select Image Directory")
 
         if directory:
-            self.file_handler.set_directory(directory)
+            self._use_file_handler(FileHandler(directory))
             self.load_images()
             self.root.title(f"Image Viewer - {directory}")
 
+    def select_archive(self):
+        """Open dialog to select a zip/tar archive and load its images."""
+        archive_path = filedialog.askopenfilename(
+            title="Select Image Archive",
+            filetypes=[
+                ("Archives", " ".join(f"*{ext}" for ext in ARCHIVE_EXTENSIONS)),
+                ("All files", "*"),
+            ],
+        )
+
+        if not archive_path:
+            return
+
+        try:
+            handler = ArchiveHandler(archive_path)
+        except Exception as e:
+            self.image_viewer.show_message(f"Error opening archive: {str(e)}")
+            return
+
+        self._use_file_handler(handler)
+        self.load_images()
+        self.root.title(f"Image Viewer - {archive_path}")
+
+    def _use_file_handler(self, handler):
+        """Switch the image source, closing any previously open archive.
+
+        Args:
+            handler: A FileHandler or ArchiveHandler
+        """
+        if isinstance(self.file_handler, ArchiveHandler):
+            self.file_handler.close()
+        self.file_handler = handler
+        can_export = isinstance(handler, ArchiveHandler) and not self.exporting
+        self.btn_export.config(state="normal" if can_export else "disabled")
+
+    def export_archive_renames(self):
+        """Write archive renames as a renamed archive copy or a CSV mapping."""
+        if not isinstance(self.file_handler, ArchiveHandler):
+            return
+
+        output_path = filedialog.asksaveasfilename(
+            title="Export Renames",
+            filetypes=[
+                (
+                    "Renamed archive",
+                    " ".join(f"*{ext}" for ext in ARCHIVE_EXTENSIONS),
+                ),
+                ("Mapping file", "*.csv"),
+            ],
+        )
+        if not output_path:
+            return
+
+        handler = self.file_handler
+        self.exporting = True
+        self.btn_export.config(state="disabled")
+        self.status_label.config(text="Exporting renames...")
+
+        def export():
+            try:
+                if output_path.lower().endswith(".csv"):
+                    handler.write_mapping(output_path)
+                else:
+                    handler.write_archive(output_path)
+                message = f"Exported {len(handler.renames())} rename(s)"
+            except Exception as e:
+                message = f"Export failed: {str(e)}"
+            self.update_bus.post_status(message)
+            self.update_bus.post_call(self._finish_export)
+
+        # Writing a large archive can take a while - keep the UI responsive
+        threading.Thread(target=export, daemon=True).start()
+
+    def _finish_export(self):
+        """Re-enable UI controls once an export has finished."""
+        self.exporting = False
+        self._restore_controls()
+
     def load_images(self):
         """Load all image files from the selected directory."""
-        # Clear previous list
+        # Clear previous list and filter
         self.image_listbox.delete(0, tk.END)
         self.image_files = []
+        self.visible_indices = None
+        self._visible_rows = {}
+        self.search_var.set("")
 
         try:
             # Get all image files
             self.image_files = self.file_handler.get_image_files()
 
-            # Populate listbox
-            for file in self.image_files:
-                self.image_listbox.insert(tk.END, file)
+            # Populate listbox in a single call
+            if self.image_files:
+                self.image_listbox.insert(tk.END, *self.image_files)
+
+            # Build the search index in the background
+            self.search_index = SearchIndex()
+            threading.Thread(
+                target=self._build_search_index,
+                args=(self.search_index, list(self.image_files)),
+                daemon=True,
+            ).start()
 
             if not self.image_files:
                 self.image_viewer.show_message("No images found in this directory")
@@ -242,6 +437,98 @@ class MainWindow:
         except Exception as e:
             self.image_viewer.show_message(f"Error loading directory: {str(e)}")
 
+    def _build_search_index(self, search_index, filenames):
+        """Build the search index with catalog titles (runs in separate thread).
+
+        Args:
+            search_index: The SearchIndex to fill
+            filenames: Image filenames in list order
+        """
+        titles = {}
+        try:
+            with ImageCatalog(self.file_handler.directory, self.catalog_dir) as catalog:
+                titles = catalog.titles()
+        except Exception as e:
+            print(f"Could not read catalog titles: {str(e)}")
+
+        search_index.build(filenames, titles)
+
+    def _on_search_changed(self, *args):  # noqa: ARG002
+        """Debounce filtering while the user types.
+
+        Args:
+            *args: Variable trace arguments (unused)
+        """
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(SEARCH_DEBOUNCE_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        """Show only images matching the search box in the listbox."""
+        self._search_job = None
+        query = self.search_var.get().strip()
+
+        if query and not self.search_index.ready:
+            # Still indexing - try again shortly
+            self.status_label.config(text="Indexing images for search...")
+            self._search_job = self.root.after(
+                SEARCH_DEBOUNCE_MS * 2, self._apply_filter
+            )
+            return
+
+        if not query and self.visible_indices is None:
+            # Already showing every image (e.g. the search box was cleared
+            # by load_images, which fills the listbox itself)
+            return
+
+        self.image_listbox.delete(0, tk.END)
+
+        if not query:
+            self.visible_indices = None
+            self._visible_rows = {}
+            if self.image_files:
+                self.image_listbox.insert(tk.END, *self.image_files)
+            return
+
+        # One extra result tells whether the view was truncated
+        matches = self.search_index.search(query, limit=SEARCH_RESULT_LIMIT + 1)
+        shown = matches[:SEARCH_RESULT_LIMIT]
+        self.visible_indices = shown
+        self._visible_rows = {index: row for row, index in enumerate(shown)}
+        if shown:
+            self.image_listbox.insert(tk.END, *(self.image_files[i] for i in shown))
+
+        status_text = f"{len(matches)} match(es)"
+        if len(matches) > len(shown):
+            status_text = f"Over {len(shown)} matches, showing first {len(shown)}"
+        self.status_label.config(text=status_text)
+
+    def _row_for_index(self, index):
+        """Get the listbox row showing an image.
+
+        Args:
+            index: Index of the image in image_files
+
+        Returns:
+            int | None: Listbox row, or None if filtered out
+        """
+        if self.visible_indices is None:
+            return index
+        return self._visible_rows.get(index)
+
+    def _index_for_row(self, row):
+        """Get the image shown in a listbox row.
+
+        Args:
+            row: Listbox row
+
+        Returns:
+            int: Index of the image in image_files
+        """
+        if self.visible_indices is None:
+            return row
+        return self.visible_indices[row]
+
     def on_image_select(self, event):  # noqa: ARG002
         """Handle image selection from the list.
 
@@ -253,7 +540,7 @@ class MainWindow:
         if not selection or not self.image_files:
             return
 
-        index = selection[0]
+        index = self._index_for_row(selection[0])
         filename = self.image_files[index]
 
         try:
@@ -264,7 +551,7 @@ class MainWindow:
 
     def start_ai_rename(self):
         """Start the AI-powered image renaming process."""
-        if self.is_processing:
+        if self.is_processing or self.interactive_indices:
             return
 
         if not self.image_files:
@@ -281,19 +568,28 @@ class MainWindow:
         self.is_processing = True
         self.btn_ai_rename.config(state="disabled")
         self.btn_select_dir.config(state="disabled")
+        self.btn_open_archive.config(state="disabled")
+        self.btn_export.config(state="disabled")
+        self.chk_only_new.config(state="disabled")
         self.model_combo.config(state="disabled")
+        self.btn_cancel.config(state="normal")
+        cancel_event = threading.Event()
+        self.cancel_events.add(cancel_event)
 
         # Start processing in a separate thread to keep UI responsive
         thread = threading.Thread(
-            target=self._process_images, args=(selected_model,), daemon=True
+            target=self._process_images,
+            args=(selected_model, cancel_event, self.only_new_var.get()),
+            daemon=True,
         )
         thread.start()
 
     def start_ai_rename_selected(self):
-        """Start the AI-powered renaming process for the selected image only."""
-        if self.is_processing:
-            return
+        """Start the AI-powered renaming process for the selected image only.
 
+        Runs in the interactive lane, so it also works while a batch is in
+        progress and jumps ahead of the batch's queued images.
+        """
         if not self.image_files:
             self.status_label.config(text="No images loaded!")
             return
@@ -310,193 +606,197 @@ class MainWindow:
             self.status_label.config(text="Please select a model!")
             return
 
+        # Get selected index
+        selected_index = self._index_for_row(selection[0])
+        if selected_index in self.interactive_indices:
+            self.status_label.config(text="That image is already being renamed")
+            return
+
         # Disable buttons and dropdown during processing
-        self.is_processing = True
+        self.interactive_indices.add(selected_index)
         self.btn_ai_rename.config(state="disabled")
-        self.btn3.config(state="disabled")
         self.btn_select_dir.config(state="disabled")
+        self.btn_open_archive.config(state="disabled")
+        self.btn_export.config(state="disabled")
         self.model_combo.config(state="disabled")
-
-        # Get selected index
-        selected_index = selection[0]
+        self.btn_cancel.config(state="normal")
+        cancel_event = threading.Event()
+        self.cancel_events.add(cancel_event)
 
         # Start processing in a separate thread to keep UI responsive
         thread = threading.Thread(
             target=self._process_single_image,
-            args=(selected_model, selected_index),
+            args=(selected_model, selected_index, cancel_event),
             daemon=True,
         )
         thread.start()
 
-    def _process_images(self, model_name):
-        """Process all images with AI (runs in separate thread).
+    def _renamer(self):
+        """Create a BatchRenamer over the current image list.
 
-        Args:
-            model_name: The Ollama model to use for processing
+        Returns:
+            BatchRenamer: Renamer sharing the window's list, lock and bus
         """
-        # Create AI service with selected model
-        ai_service = OllamaService(model_name, MAX_TITLE_LENGTH)
-
-        total_images = len(self.image_files)
-        renamed_count = 0
-        failed_count = 0
-
-        for index, filename in enumerate(self.image_files[:], 1):
-            try:
-                # Update status
-                self.root.after(
-                    0,
-                    lambda i=index, t=total_images: self.status_label.config(
-                        text=f"Processing {i}/{t}..."
-                    ),
-                )
-
-                # Select and display the current image
-                self.root.after(0, lambda idx=index - 1: self._select_image(idx))
-
-                # Show "Analyzing..." in preview box
-                self.root.after(
-                    0,
-                    lambda f=filename: self._update_name_preview(
-                        f"Analyzing: {f}\n⏳ Generating name..."
-                    ),
-                )
-
-                # Get full filepath
-                filepath = self.file_handler.get_file_path(filename)
+        return BatchRenamer(
+            self.file_handler,
+            self.image_files,
+            self.scheduler,
+            self.update_bus,
+            self.rename_lock,
+            catalog_dir=self.catalog_dir,
+        )
 
-                # Generate title using AI
-                new_title = ai_service.generate_title(filepath)
+    def _process_images(self, model_name, cancel_event, only_new=False):
+        """Process all images with AI (runs in separate thread).
 
-                # Show generated name in preview box
-                self.root.after(
-                    0,
-                    lambda nt=new_title: self._update_name_preview(
-                        f"✓ Generated: {nt}"
-                    ),
-                )
+        UI updates are pushed to the update bus rather than scheduled
+        per image, so a fast batch cannot flood the Tk event queue.
 
-                # Rename the file
-                new_filename = self.file_handler.rename_image(filename, new_title)
+        Args:
+            model_name: Model combobox label (see ``model_choice``)
+            cancel_event: Event set to cancel this batch
+            only_new: Only process files that are new or modified since
+                they were last recorded in the directory catalog
+        """
+        # Create AI service with selected model
+        ai_service = OllamaService.from_model_choice(
+            model_name,
+            MAX_TITLE_LENGTH,
+            cancel_event=cancel_event,
+            payload_cache=self.payload_cache,
+        )
+        bus = self.update_bus
+        renamer = self._renamer()
 
-                # Update the image_files list
-                self.image_files[index - 1] = new_filename
+        try:
+            if not renamer.run(ai_service, model_name, cancel_event, only_new):
+                bus.post_call(self._abort_rename, model_name)
+                return
+
+            # Show the completion summary once pending updates are applied
+            latency_summary = ai_service.latency.summary()
+            print(f"Request latency: {latency_summary}")
+            bus.post_call(
+                self._finalize_rename,
+                renamer.renamed_count,
+                renamer.failed_count,
+                latency_summary,
+                renamer.cancelled,
+            )
 
-                # Update the listbox immediately with the new name
-                self.root.after(
-                    0,
-                    lambda idx=index - 1, nf=new_filename: self._update_listbox_item(
-                        idx, nf
-                    ),
-                )
+        except Exception as e:
+            print(f"Error starting batch: {str(e)}")
+            bus.post_call(
+                self._finalize_rename, renamer.renamed_count, renamer.failed_count
+            )
 
-                renamed_count += 1
+        finally:
+            ai_service.close()
+            bus.post_call(self.cancel_events.discard, cancel_event)
 
-            except Exception as e:
-                error_msg = str(e)
-                print(f"Error processing {filename}: {error_msg}")
-                self.root.after(
-                    0,
-                    lambda err=error_msg: self._update_name_preview(f"❌ Error: {err}"),
-                )
-                failed_count += 1
-                continue
-
-        # Reload the image list to show new names
-        self.root.after(0, self._finalize_rename, renamed_count, failed_count)
-
-    def _process_single_image(self, model_name, image_index):
+    def _process_single_image(self, model_name, image_index, cancel_event):
         """Process a single selected image with AI (runs in separate thread).
 
         Args:
-            model_name: The Ollama model to use for processing
+            model_name: Model combobox label (see ``model_choice``)
             image_index: The index of the image to process
+            cancel_event: Event set to cancel this request
         """
         # Create AI service with selected model
-        ai_service = OllamaService(model_name, MAX_TITLE_LENGTH)
+        ai_service = OllamaService.from_model_choice(
+            model_name,
+            MAX_TITLE_LENGTH,
+            cancel_event=cancel_event,
+            payload_cache=self.payload_cache,
+        )
+        bus = self.update_bus
 
         try:
             filename = self.image_files[image_index]
 
-            # Update status
-            self.root.after(
-                0,
-                lambda: self.status_label.config(text="Processing selected image..."),
-            )
-
-            # Show "Analyzing..." in preview box
-            self.root.after(
-                0,
-                lambda: self._update_name_preview(
-                    f"Analyzing: {filename}\n⏳ Generating name..."
-                ),
-            )
+            # Update status and show "Analyzing..." in preview box
+            bus.post_status("Processing selected image...")
+            bus.post_preview(f"Analyzing: {filename}\n⏳ Generating name...")
 
             # Get full filepath
             filepath = self.file_handler.get_file_path(filename)
 
-            # Generate title using AI
-            new_title = ai_service.generate_title(filepath)
+            # Generate title using AI, ahead of any queued batch work
+            new_title = self.scheduler.submit(
+                ai_service.generate_title, filepath, lane=INTERACTIVE
+            ).result()
 
             # Show generated name in preview box
-            self.root.after(
-                0,
-                lambda: self._update_name_preview(f"✓ Generated: {new_title}"),
-            )
+            bus.post_preview(f"✓ Generated: {new_title}")
 
             # Rename the file
-            new_filename = self.file_handler.rename_image(filename, new_title)
-
-            # Update the image_files list
-            self.image_files[image_index] = new_filename
+            renamer = self._renamer()
+            new_filename = renamer.apply_rename(image_index, filename, new_title)
+            if new_filename is None:
+                bus.post_status("Image was already renamed by the batch")
+                return
 
-            # Update the listbox immediately with the new name
-            self.root.after(
-                0,
-                lambda: self._update_listbox_item(image_index, new_filename),
-            )
+            with renamer.open_catalog() as catalog:
+                renamer.record_rename(catalog, new_filename, model_name, new_title)
 
             # Update status with success message
-            self.root.after(
-                0,
-                lambda: self.status_label.config(
-                    text=f"Successfully renamed to: {new_title}"
-                ),
-            )
+            bus.post_status(f"Successfully renamed to: {new_title}")
+
+        except RequestCancelledError:
+            bus.post_preview("Cancelled")
+            bus.post_status("Cancelled - image left unchanged")
 
         except Exception as e:
             error_msg = str(e)
             print(f"Error processing image: {error_msg}")
-            self.root.after(
-                0,
-                lambda: self._update_name_preview(f"❌ Error: {error_msg}"),
-            )
-            self.root.after(
-                0,
-                lambda: self.status_label.config(text=f"Error: {error_msg}"),
-            )
+            bus.post_preview(f"❌ Error: {error_msg}")
+            bus.post_status(f"Error: {error_msg}")
 
         finally:
             # Re-enable buttons and dropdown
-            self.root.after(0, self._finalize_single_rename)
+            ai_service.close()
+            bus.post_call(self.cancel_events.discard, cancel_event)
+            bus.post_call(self._finalize_single_rename, image_index)
+
+    def _finalize_single_rename(self, image_index):
+        """Re-enable UI controls after processing a single image.
+
+        Args:
+            image_index: The index of the image that was processed
+        """
+        self.interactive_indices.discard(image_index)
+        self._restore_controls()
+
+    def _restore_controls(self):
+        """Re-enable UI controls once no rename is running."""
+        if self.is_processing or self.interactive_indices:
+            # The batch or another interactive request is still running
+            return
 
-    def _finalize_single_rename(self):
-        """Re-enable UI controls after processing a single image."""
         self.btn_ai_rename.config(state="normal")
-        self.btn3.config(state="normal")
         self.btn_select_dir.config(state="normal")
+        self.btn_open_archive.config(state="normal")
+        self.chk_only_new.config(state="normal")
+        self.btn_cancel.config(state="disabled")
         self.model_combo.config(state="readonly")
-        self.is_processing = False
+        if isinstance(self.file_handler, ArchiveHandler) and not self.exporting:
+            self.btn_export.config(state="normal")
 
-    def _select_image(self, index):
+    def _select_image(self, index, show_image=True):
         """Select an image in the listbox programmatically.
 
         Args:
             index: The index of the image to select
+            show_image: Whether to render the image preview as well
         """
-        self.image_listbox.selection_clear(0, tk.END)
-        self.image_listbox.selection_set(index)
-        self.image_listbox.see(index)
+        row = self._row_for_index(index)
+        if row is not None:
+            self.image_listbox.selection_clear(0, tk.END)
+            self.image_listbox.selection_set(row)
+            self.image_listbox.see(row)
+
+        if not show_image:
+            return
 
         # Trigger display
         if index < len(self.image_files):
@@ -518,40 +818,117 @@ class MainWindow:
         self.name_preview_text.insert("1.0", text)
         self.name_preview_text.config(state=tk.DISABLED)
 
-    def _update_listbox_item(self, index, new_filename):
+    def _update_listbox_item(self, index, new_filename, select=True):
         """Update a single item in the listbox with new filename.
 
+        The search index is updated in place so filtered views stay
+        correct without rebuilding.
+
         Args:
-            index: The index of the item to update
+            index: The index of the image in image_files
             new_filename: The new filename to display
+            select: Whether to select and scroll to the item
         """
-        if 0 <= index < self.image_listbox.size():
-            self.image_listbox.delete(index)
-            self.image_listbox.insert(index, new_filename)
-            self.image_listbox.selection_set(index)
-            self.image_listbox.see(index)
+        self.search_index.update(index, new_filename)
+
+        row = self._row_for_index(index)
+        if row is not None and 0 <= row < self.image_listbox.size():
+            self.image_listbox.delete(row)
+            self.image_listbox.insert(row, new_filename)
+            if select:
+                self.image_listbox.selection_clear(0, tk.END)
+                self.image_listbox.selection_set(row)
+                self.image_listbox.see(row)
 
-    def _finalize_rename(self, renamed_count, failed_count):
+    def _update_listbox_items(self, renames):
+        """Apply a batch of listbox renames in one pass.
+
+        Args:
+            renames: List of (index, new_filename) pairs sorted by index
+        """
+        for index, new_filename in renames:
+            self._update_listbox_item(index, new_filename, select=False)
+
+        # Keep the most recent rename selected and visible
+        row = self._row_for_index(renames[-1][0])
+        if row is not None and 0 <= row < self.image_listbox.size():
+            self.image_listbox.selection_clear(0, tk.END)
+            self.image_listbox.selection_set(row)
+            self.image_listbox.see(row)
+
+    def _finalize_rename(
+        self, renamed_count, failed_count, latency_summary=None, cancelled=False
+    ):
         """Finalize the rename process and update UI.
 
         Args:
             renamed_count: Number of successfully renamed images
             failed_count: Number of failed renames
+            latency_summary: Optional request latency summary to display
+            cancelled: Whether the batch was cancelled before finishing
         """
-        # Update status
-        status_text = f"Complete! Renamed: {renamed_count}"
-        if failed_count > 0:
-            status_text += f", Failed: {failed_count}"
-        self.status_label.config(text=status_text)
+        heading = "Cancelled" if cancelled else "Complete"
+        marker = "⚠" if cancelled else "✅"
 
-        # Update preview box with completion message
-        preview_text = f"✅ Processing Complete!\nRenamed: {renamed_count}"
-        if failed_count > 0:
-            preview_text += f"\nFailed: {failed_count}"
-        self._update_name_preview(preview_text)
+        try:
+            # Update status
+            status_text = f"{heading}! Renamed: {renamed_count}"
+            if failed_count > 0:
+                status_text += f", Failed: {failed_count}"
+            self.status_label.config(text=status_text)
+
+            # Update preview box with completion message
+            preview_text = f"{marker} Processing {heading}!\nRenamed: {renamed_count}"
+            if failed_count > 0:
+                preview_text += f"\nFailed: {failed_count}"
+            if latency_summary:
+                preview_text += f"\nLatency: {latency_summary}"
+            self._update_name_preview(preview_text)
 
-        # Re-enable buttons and dropdown
-        self.btn_ai_rename.config(state="normal")
-        self.btn_select_dir.config(state="normal")
-        self.model_combo.config(state="readonly")
-        self.is_processing = False
+        finally:
+            # Re-enable buttons and dropdown
+            self.is_processing = False
+            self._restore_controls()
+
+    def _abort_rename(self, model_name):
+        """Stop a batch because the selected model cannot analyze images.
+
+        Args:
+            model_name: The model that was rejected
+        """
+        try:
+            self.status_label.config(
+                text=f"Aborted: '{model_name}' is not a vision model"
+            )
+            self._update_name_preview(
+                f"❌ '{model_name}' does not support images.\n"
+                f"Install a vision model: ollama pull llama3.2-vision"
+            )
+
+        finally:
+            # Re-enable buttons and dropdown
+            self.is_processing = False
+            self._restore_controls()
+
+    def cancel_processing(self):
+        """Cancel the running rename, aborting the in-flight request."""
+        if not self.is_processing and not self.interactive_indices:
+            return
+        for cancel_event in self.cancel_events:
+            cancel_event.set()
+        self.btn_cancel.config(state="disabled")
+        self.status_label.config(text="Cancelling...")
+
+    def shutdown(self):
+        """Cancel any running rename and close the window once it has stopped.
+
+        Waiting for the worker lets the current file's rename and catalog
+        entry finish so the directory and catalog stay consistent.
+        """
+        self.cancel_processing()
+        if self.is_processing or self.interactive_indices:
+            self.root.after(100, self.shutdown)
+            return
+        self.update_bus.stop()
+        self.scheduler.shutdown()
+        self.root.destroy()
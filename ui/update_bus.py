@@ -0,0 +1,164 @@
+"""Coalescing bus for pushing UI updates from worker threads."""
+
+import threading
+import time
+import traceback
+from collections import deque
+
+from models.config import (
+    UI_REFRESH_INTERVAL_MS,
+    PREVIEW_SKIP_RATE,
+    THROUGHPUT_WINDOW_SECONDS,
+)
+
+
+class UIUpdateBus:
+    """Collects UI state from worker threads and applies it at a fixed rate.
+
+    Worker threads never touch Tk widgets directly. Instead they push state
+    into the bus, which keeps only the latest status text, preview text and
+    selected image, and accumulates listbox renames. The Tk side drains the
+    bus once per frame, so a fast batch costs at most one redraw per frame
+    instead of several ``root.after`` callbacks per image.
+    """
+
+    def __init__(
+        self,
+        root,
+        on_status,
+        on_preview,
+        on_select,
+        on_renames,
+        interval_ms=UI_REFRESH_INTERVAL_MS,
+    ):
+        """Initialize the update bus.
+
+        Args:
+            root: The root tkinter window used for scheduling
+            on_status: Callback taking the latest status text
+            on_preview: Callback taking the latest preview text
+            on_select: Callback taking (index, show_image) for the latest selection
+            on_renames: Callback taking a list of (index, new_filename) pairs
+            interval_ms: Drain interval in milliseconds
+        """
+        self.root = root
+        self.on_status = on_status
+        self.on_preview = on_preview
+        self.on_select = on_select
+        self.on_renames = on_renames
+        self.interval_ms = interval_ms
+
+        self._lock = threading.Lock()
+        self._status = None
+        self._preview = None
+        self._select = None
+        self._renames = {}
+        self._calls = []
+        self._completions = deque()
+        self._running = False
+
+    def start(self):
+        """Start draining the bus on the Tk event loop."""
+        if not self._running:
+            self._running = True
+            self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        """Stop draining the bus."""
+        self._running = False
+
+    def post_status(self, text):
+        """Set the latest status text.
+
+        Args:
+            text: Status text to show
+        """
+        with self._lock:
+            self._status = text
+
+    def post_preview(self, text):
+        """Set the latest preview text.
+
+        Args:
+            text: Preview text to show
+        """
+        with self._lock:
+            self._preview = text
+
+    def post_select(self, index):
+        """Set the image that should be selected and displayed.
+
+        Args:
+            index: Listbox index of the image
+        """
+        with self._lock:
+            self._select = index
+
+    def post_rename(self, index, new_filename):
+        """Queue a listbox rename and record it for throughput tracking.
+
+        Args:
+            index: Listbox index of the renamed image
+            new_filename: The new filename to display
+        """
+        with self._lock:
+            self._renames[index] = new_filename
+            self._completions.append(time.monotonic())
+
+    def post_call(self, callback, *args):
+        """Queue a one-off callback to run after pending state is applied.
+
+        Args:
+            callback: Callable to invoke on the Tk thread
+            *args: Arguments for the callback
+        """
+        with self._lock:
+            self._calls.append((callback, args))
+
+    def throughput(self):
+        """Get recent completion throughput.
+
+        Returns:
+            float: Images completed per second over the recent window
+        """
+        cutoff = time.monotonic() - THROUGHPUT_WINDOW_SECONDS
+        with self._lock:
+            while self._completions and self._completions[0] < cutoff:
+                self._completions.popleft()
+            return len(self._completions) / THROUGHPUT_WINDOW_SECONDS
+
+    def _drain(self):
+        """Apply pending state to the UI (runs on the Tk thread)."""
+        if not self._running:
+            return
+
+        show_image = self.throughput() < PREVIEW_SKIP_RATE
+
+        with self._lock:
+            status, self._status = self._status, None
+            preview, self._preview = self._preview, None
+            select, self._select = self._select, None
+            renames, self._renames = self._renames, {}
+            calls, self._calls = self._calls, []
+
+        updates = []
+        if renames:
+            updates.append((self.on_renames, (sorted(renames.items()),)))
+        if select is not None:
+            updates.append((self.on_select, (select, show_image)))
+        if preview is not None:
+            updates.append((self.on_preview, (preview,)))
+        if status is not None:
+            updates.append((self.on_status, (status,)))
+        updates.extend(calls)
+
+        # One failing update must not drop the rest of the frame, which may
+        # include calls such as the batch's completion handler
+        for callback, args in updates:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error applying UI update: {str(e)}")
+                traceback.print_exc()
+
+        self.root.after(self.interval_ms, self._drain)
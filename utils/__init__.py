@@ -1,5 +1,24 @@
 """Utility functions package for the Image Viewer application."""
 
-from utils.file_handler import FileHandler
+from utils.archive_handler import ArchiveHandler, is_archive
+from utils.catalog import ImageCatalog
+from utils.file_handler import FileHandler, natural_sort_key
+from utils.job_queue import JobQueue, JobQueueServer, RemoteJobQueue, open_job_queue
+from utils.payload_cache import PayloadCache
+from utils.readahead import ReadaheadPool
+from utils.search_index import SearchIndex
 
-__all__ = ["FileHandler"]
+__all__ = [
+    "ArchiveHandler",
+    "FileHandler",
+    "ImageCatalog",
+    "JobQueue",
+    "JobQueueServer",
+    "PayloadCache",
+    "ReadaheadPool",
+    "RemoteJobQueue",
+    "SearchIndex",
+    "is_archive",
+    "natural_sort_key",
+    "open_job_queue",
+]
@@ -0,0 +1,383 @@
+"""Reading and renaming images inside zip/tar archives without extracting."""
+
+import csv
+import os
+import posixpath
+import shutil
+import tarfile
+import threading
+import time
+import zipfile
+from io import BytesIO
+
+from models.config import IMAGE_EXTENSIONS, ARCHIVE_MAX_MEMBER_MB
+
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+COPY_CHUNK_SIZE = 1024 * 1024
+ZIP_EPOCH = 315532800  # 1980-01-01, the earliest time a zip entry can hold
+
+
+def is_archive(path):
+    """Check whether a path looks like a supported archive.
+
+    Args:
+        path: Path to check
+
+    Returns:
+        bool: True for zip and tar archives
+    """
+    return os.path.isfile(path) and path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def _tar_write_mode(path):
+    """Get the tarfile write mode matching an output filename.
+
+    Args:
+        path: Output archive path
+
+    Returns:
+        str: Mode for ``tarfile.open``
+    """
+    lower = path.lower()
+    if lower.endswith((".tar.gz", ".tgz")):
+        return "w:gz"
+    if lower.endswith(".tar.bz2"):
+        return "w:bz2"
+    if lower.endswith(".tar.xz"):
+        return "w:xz"
+    return "w"
+
+
+class ArchiveMember:
+    """Reference to an image inside an archive.
+
+    Stands in for a file path: ``ImageViewer``, ``OllamaService`` and
+    ``ImageCatalog`` read it through ``open``/``read_bytes``.
+    """
+
+    def __init__(self, handler, name):
+        """Initialize the reference.
+
+        Args:
+            handler: The ArchiveHandler that owns the archive
+            name: Original member name inside the archive
+        """
+        self.handler = handler
+        self.name = name
+
+    def open(self):
+        """Open the member for reading.
+
+        Returns:
+            BytesIO: The member contents
+        """
+        return BytesIO(self.read_bytes())
+
+    def read_bytes(self):
+        """Read the member contents.
+
+        Returns:
+            bytes: The member contents
+        """
+        return self.handler.read_member(self.name)
+
+    def __eq__(self, other):
+        """Compare references by archive and member name."""
+        return (
+            isinstance(other, ArchiveMember)
+            and other.handler is self.handler
+            and other.name == self.name
+        )
+
+    def __hash__(self):
+        """Hash by archive and member name."""
+        return hash((id(self.handler), self.name))
+
+    def __str__(self):
+        """Show the member as ``archive:member``."""
+        return f"{self.handler.directory}:{self.name}"
+
+
+class ArchiveHandler:
+    """Exposes the images in an archive through the FileHandler interface.
+
+    Renames are virtual: they are recorded in a mapping from original
+    member name to new name, which can be written out as a renamed copy
+    of the archive (one sequential pass) or as a CSV mapping file. Only
+    one member is held in memory at a time, and members larger than
+    ``ARCHIVE_MAX_MEMBER_MB`` are skipped.
+    """
+
+    network_mode = False
+
+    def __init__(self, archive_path):
+        """Open an archive.
+
+        Args:
+            archive_path: Path to a zip or tar archive
+
+        Raises:
+            OSError: If the archive cannot be read
+            ValueError: If the file is not a supported archive
+        """
+        self.directory = archive_path
+        self._lock = threading.Lock()
+        self._is_zip = zipfile.is_zipfile(archive_path)
+        if not self._is_zip and not tarfile.is_tarfile(archive_path):
+            raise ValueError(f"Unsupported archive: {archive_path}")
+        self._archive = self._open_archive()
+
+        self._members = {}  # Original name -> archive member info
+        self._order = []  # Original image names in archive order
+        self._current = {}  # Current (possibly renamed) name -> original name
+        self._load_members()
+
+    def _open_archive(self):
+        """Open a new handle on the archive.
+
+        Returns:
+            zipfile.ZipFile | tarfile.TarFile: The opened archive
+        """
+        if self._is_zip:
+            return zipfile.ZipFile(self.directory)
+        return tarfile.open(self.directory, "r:*")
+
+    def _load_members(self):
+        """Index image members in archive order."""
+        max_bytes = ARCHIVE_MAX_MEMBER_MB * 1024 * 1024
+        if self._is_zip:
+            members = [
+                (info.filename, info.file_size, info)
+                for info in self._archive.infolist()
+                if not info.is_dir()
+            ]
+        else:
+            members = [
+                (info.name, info.size, info)
+                for info in self._archive.getmembers()
+                if info.isfile()
+            ]
+
+        for name, size, info in members:
+            if not name.lower().endswith(IMAGE_EXTENSIONS) or size > max_bytes:
+                continue
+            self._members[name] = info
+            self._order.append(name)
+            self._current[name] = name
+
+    def close(self):
+        """Close the archive."""
+        self._archive.close()
+
+    def set_directory(self, directory):
+        """Archives are fixed at construction; kept for interface parity.
+
+        Args:
+            directory: Ignored unless it is the open archive
+
+        Raises:
+            ValueError: If a different path is given
+        """
+        if directory != self.directory:
+            raise ValueError("Open a new ArchiveHandler to change archives")
+
+    def read_member(self, name):
+        """Read an image member by its original name.
+
+        Args:
+            name: Original member name
+
+        Returns:
+            bytes: The member contents
+        """
+        info = self._members[name]
+        with self._lock:
+            if self._is_zip:
+                return self._archive.read(info)
+            member_file = self._archive.extractfile(info)
+            return member_file.read()
+
+    def get_image_files(self):
+        """Get current names of all images in archive order.
+
+        Archive order is kept (rather than natural sort) so batches read
+        compressed tar archives sequentially.
+
+        Returns:
+            list: List of image names
+        """
+        originals = {original: name for name, original in self._current.items()}
+        return [originals[name] for name in self._order]
+
+    def scan_images(self):
+        """Get signatures for all images.
+
+        Returns:
+            dict: Mapping of current name to (crc_or_0, size, mtime_ns)
+        """
+        return {name: self.get_signature(name) for name in self._current}
+
+    def get_signature(self, filename):
+        """Get a stable signature for a member.
+
+        Args:
+            filename: Current name of the member
+
+        Returns:
+            tuple: (crc_or_0, size, mtime_ns)
+        """
+        info = self._members[self._current[filename]]
+        if self._is_zip:
+            return (info.CRC, info.file_size, 0)
+        return (0, info.size, int(info.mtime * 1_000_000_000))
+
+    def get_file_path(self, filename):
+        """Get a reference to a member by its current name.
+
+        Args:
+            filename: Current name of the member
+
+        Returns:
+            ArchiveMember: Reference usable in place of a file path
+        """
+        return ArchiveMember(self, self._current[filename])
+
+    def rename_image(self, old_filename, new_title):
+        """Rename a member (virtually) with a new title.
+
+        The directory part of the member name is kept.
+
+        Args:
+            old_filename: Current name of the member
+            new_title: New title (without extension)
+
+        Returns:
+            str: The new name
+        """
+        folder, base = posixpath.split(old_filename)
+        _, ext = posixpath.splitext(base)
+
+        new_filename = posixpath.join(folder, f"{new_title}{ext}")
+        counter = 1
+        while new_filename in self._current:
+            new_filename = posixpath.join(folder, f"{new_title}_{counter}{ext}")
+            counter += 1
+
+        self._current[new_filename] = self._current.pop(old_filename)
+        return new_filename
+
+    def renames(self):
+        """Get the renames made so far.
+
+        Returns:
+            dict: Mapping of original member name to new name
+        """
+        return {
+            original: name
+            for name, original in self._current.items()
+            if name != original
+        }
+
+    def write_mapping(self, output_path):
+        """Write the renames as a CSV file.
+
+        Args:
+            output_path: Path of the CSV file to write
+        """
+        with open(output_path, "w", newline="", encoding="utf-8") as mapping_file:
+            writer = csv.writer(mapping_file)
+            writer.writerow(["original_name", "new_name"])
+            for original, name in sorted(self.renames().items()):
+                writer.writerow([original, name])
+
+    def write_archive(self, output_path):
+        """Write a copy of the archive with renamed members.
+
+        Members are streamed from the source archive in order, so memory
+        use does not depend on archive or member size. Non-image members
+        are copied unchanged. The output format follows the output
+        extension (``.zip`` or a tar variant). The export reads through
+        its own handle, so previews are not blocked while it runs.
+
+        Args:
+            output_path: Path of the archive to write
+
+        Raises:
+            ValueError: If the output is the source archive itself
+        """
+        if os.path.exists(output_path) and os.path.samefile(
+            output_path, self.directory
+        ):
+            raise ValueError("Cannot export over the source archive")
+
+        renames = self.renames()
+        with self._open_archive() as source:
+            if output_path.lower().endswith(".zip"):
+                self._write_zip(source, output_path, renames)
+            else:
+                self._write_tar(source, output_path, renames)
+
+    def _iter_source(self, source):
+        """Iterate source members with an opener for their contents.
+
+        Args:
+            source: Archive handle to read from
+
+        Yields:
+            tuple: (name, size, mtime_seconds, open_callable)
+        """
+        if self._is_zip:
+            for info in source.infolist():
+                if info.is_dir():
+                    continue
+                yield (
+                    info.filename,
+                    info.file_size,
+                    time.mktime(info.date_time + (0, 0, -1)),
+                    lambda info=info: source.open(info),
+                )
+        else:
+            for info in source:
+                if not info.isfile():
+                    continue
+                yield (
+                    info.name,
+                    info.size,
+                    info.mtime,
+                    lambda info=info: source.extractfile(info),
+                )
+
+    def _write_zip(self, source, output_path, renames):
+        """Stream members into a new zip archive.
+
+        Args:
+            source: Archive handle to read from
+            output_path: Path of the zip to write
+            renames: Mapping of original name to new name
+        """
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as output:
+            for name, _, mtime, opener in self._iter_source(source):
+                info = zipfile.ZipInfo(
+                    renames.get(name, name),
+                    date_time=time.localtime(max(mtime, ZIP_EPOCH))[:6],
+                )
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with opener() as member, output.open(info, "w") as target:
+                    shutil.copyfileobj(member, target, COPY_CHUNK_SIZE)
+
+    def _write_tar(self, source, output_path, renames):
+        """Stream members into a new tar archive.
+
+        Args:
+            source: Archive handle to read from
+            output_path: Path of the tar to write
+            renames: Mapping of original name to new name
+        """
+        with tarfile.open(output_path, _tar_write_mode(output_path)) as output:
+            for name, size, mtime, opener in self._iter_source(source):
+                info = tarfile.TarInfo(renames.get(name, name))
+                info.size = size
+                info.mtime = mtime
+                with opener() as member:
+                    output.addfile(info, member)
@@ -0,0 +1,160 @@
+"""Per-directory catalog of processed images."""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+from models.config import CATALOG_DIR
+
+
+class ImageCatalog:
+    """Records which files have been renamed, keyed by their stat signature.
+
+    Each directory gets its own SQLite database in the cache directory. A
+    file is considered unchanged when a row exists with the same inode, size
+    and modification time, so deciding what is new only needs a single
+    ``scandir`` pass and never reads file contents.
+
+    SQLite connections are bound to the thread that opened them, so create
+    the catalog in the thread that uses it.
+    """
+
+    def __init__(self, directory, catalog_dir=CATALOG_DIR):
+        """Open (or create) the catalog for a directory.
+
+        Args:
+            directory: The image directory being cataloged
+            catalog_dir: Directory that holds catalog databases
+        """
+        self.directory = os.path.abspath(directory)
+        key = hashlib.sha1(self.directory.encode("utf-8")).hexdigest()[:16]
+
+        os.makedirs(catalog_dir, exist_ok=True)
+        self.path = os.path.join(catalog_dir, f"{key}.sqlite3")
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                filename TEXT PRIMARY KEY,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT,
+                model TEXT,
+                title TEXT,
+                renamed_at REAL
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS files_signature "
+            "ON files (inode, size, mtime_ns)"
+        )
+        self.connection.commit()
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self):
+        """Use the catalog as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        """Close the catalog when leaving the context."""
+        self.close()
+
+    def _signatures(self):
+        """Get the stat signatures of every cataloged file.
+
+        Returns:
+            set[tuple]: Set of (inode, size, mtime_ns) tuples
+        """
+        rows = self.connection.execute("SELECT inode, size, mtime_ns FROM files")
+        return set(rows)
+
+    def changed_files(self, entries):
+        """Find files that are new or modified since they were cataloged.
+
+        Files renamed outside the app still match by inode, size and
+        modification time.
+
+        Args:
+            entries: Mapping of filename to (inode, size, mtime_ns)
+
+        Returns:
+            list[str]: Filenames without a matching catalog entry
+        """
+        known = self._signatures()
+        return [name for name, signature in entries.items() if signature not in known]
+
+    def titles(self):
+        """Get AI titles for cataloged files.
+
+        Returns:
+            dict: Mapping of filename to generated title
+        """
+        rows = self.connection.execute(
+            "SELECT filename, title FROM files WHERE title IS NOT NULL"
+        )
+        return dict(rows)
+
+    @staticmethod
+    def hash_file(filepath, chunk_size=1024 * 1024):
+        """Compute a content hash for a file.
+
+        Args:
+            filepath: Path to the file, or an archive member
+            chunk_size: Bytes to read per chunk
+
+        Returns:
+            str: Hex digest of the file contents
+        """
+        if hasattr(filepath, "read_bytes"):
+            return ImageCatalog.hash_bytes(filepath.read_bytes())
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(filepath, "rb") as image_file:
+            for chunk in iter(lambda: image_file.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_bytes(data):
+        """Compute a content hash for data already in memory.
+
+        Args:
+            data: The file contents
+
+        Returns:
+            str: Hex digest matching ``hash_file`` for the same contents
+        """
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def record(self, filename, signature, content_hash=None, model=None, title=None):
+        """Record a processed file.
+
+        Args:
+            filename: Current filename (after any rename)
+            signature: The file's (inode, size, mtime_ns)
+            content_hash: Optional content hash of the file
+            model: Model that generated the title
+            title: The generated title
+        """
+        inode, size, mtime_ns = signature
+        # Drop stale rows for the same file under its previous name
+        self.connection.execute(
+            "DELETE FROM files WHERE inode = ? AND size = ? AND mtime_ns = ?",
+            (inode, size, mtime_ns),
+        )
+        self.connection.execute(
+            """
+            INSERT OR REPLACE INTO files
+                (filename, inode, size, mtime_ns, content_hash, model, title,
+                 renamed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (filename, inode, size, mtime_ns, content_hash, model, title, time.time()),
+        )
+        self.connection.commit()
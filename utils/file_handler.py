@@ -1,19 +1,50 @@
 """File handling utilities for image operations."""
 
+import errno
 import os
-from models.config import IMAGE_EXTENSIONS
+import re
+from models.config import IMAGE_EXTENSIONS, NETWORK_IO_MODE
+
+
+def natural_sort_key(filename):
+    """Get a sort key that orders embedded numbers numerically.
+
+    ``img2.jpg`` sorts before ``img10.jpg``.
+
+    Args:
+        filename: The filename to build a key for
+
+    Returns:
+        list: Sort key of alternating text and integer parts
+    """
+    return [
+        int(part) if part.isdigit() else part.lower()
+        for part in re.split(r"(\d+)", filename)
+    ]
 
 
 class FileHandler:
-    """Handles file system operations for image files."""
+    """Handles file system operations for image files.
 
-    def __init__(self, directory=None):
+    In network mode every name in the directory is remembered from the
+    last ``scandir`` pass, and collision checks and signatures come from
+    that snapshot instead of probing the share again. Renames keep the
+    snapshot up to date. Names are compared case-insensitively, as SMB
+    shares usually are, and the final rename never replaces a file that
+    appeared after the scan.
+    """
+
+    def __init__(self, directory=None, network_mode=NETWORK_IO_MODE):
         """Initialize the file handler.
 
         Args:
             directory: The directory path to work with
+            network_mode: Use a directory snapshot instead of per-file probes
         """
         self.directory = directory
+        self.network_mode = network_mode
+        self._snapshot = None  # Filename -> stat signature (None for non-images)
+        self._taken = None  # Case-folded names in the snapshot
 
     def set_directory(self, directory):
         """Set the working directory.
@@ -22,12 +53,26 @@ class FileHandler:
             directory: The directory path to set
         """
         self.directory = directory
+        self._snapshot = None
+        self._taken = None
 
     def get_image_files(self):
         """Get all image files from the current directory.
 
         Returns:
-            list: List of image filenames
+            list: List of image filenames in natural-sort order
+
+        Raises:
+            ValueError: If no directory is set
+            OSError: If directory cannot be read
+        """
+        return sorted(self.scan_images(), key=natural_sort_key)
+
+    def scan_images(self):
+        """Stat all image files in the current directory in a single pass.
+
+        Returns:
+            dict: Mapping of filename to (inode, size, mtime_ns)
 
         Raises:
             ValueError: If no directory is set
@@ -36,14 +81,57 @@ class FileHandler:
         if not self.directory:
             raise ValueError("No directory set")
 
-        image_files = []
-        files = os.listdir(self.directory)
+        entries = {}
+        snapshot = {}
+        with os.scandir(self.directory) as scanner:
+            for entry in scanner:
+                snapshot[entry.name] = None
+                if not entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries[entry.name] = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        if self.network_mode:
+            snapshot.update(entries)
+            self._snapshot = snapshot
+            self._taken = {name.casefold() for name in snapshot}
+
+        return entries
+
+    def get_signature(self, filename):
+        """Get the stat signature of a single file.
+
+        Args:
+            filename: The name of the file
+
+        Returns:
+            tuple: (inode, size, mtime_ns)
+
+        Raises:
+            ValueError: If no directory is set
+            OSError: If the file cannot be read
+        """
+        if self._snapshot is not None and self._snapshot.get(filename):
+            return self._snapshot[filename]
+
+        stat = os.stat(self.get_file_path(filename))
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _exists(self, filename):
+        """Check whether a name is taken in the current directory.
 
-        for file in files:
-            if file.lower().endswith(IMAGE_EXTENSIONS):
-                image_files.append(file)
+        Args:
+            filename: The name to check
 
-        return sorted(image_files)
+        Returns:
+            bool: True if a file with that name exists
+        """
+        if self._snapshot is not None:
+            return filename.casefold() in self._taken
+        return os.path.exists(os.path.join(self.directory, filename))
 
     def get_file_path(self, filename):
         """Get the full path for a filename.
@@ -85,17 +173,55 @@ class FileHandler:
         # Create new filename
         new_filename = f"{new_title}{ext}"
 
-        # Handle filename collisions
+        old_path = os.path.join(self.directory, old_filename)
+
+        # Handle filename collisions; in network mode the claim catches
+        # names taken since the last scan, which the snapshot cannot know about
         counter = 1
-        while os.path.exists(os.path.join(self.directory, new_filename)):
+        while True:
+            if not self._exists(new_filename):
+                new_path = os.path.join(self.directory, new_filename)
+                if self._snapshot is None or self._claim(new_path):
+                    break
+                self._snapshot[new_filename] = None
+                self._taken.add(new_filename.casefold())
             new_filename = f"{new_title}_{counter}{ext}"
             counter += 1
 
-        # Get full paths
-        old_path = os.path.join(self.directory, old_filename)
-        new_path = os.path.join(self.directory, new_filename)
-
-        # Rename the file
-        os.rename(old_path, new_path)
+        if self._snapshot is None:
+            # Rename the file
+            os.rename(old_path, new_path)
+        else:
+            # Rename the file over the empty placeholder
+            try:
+                os.replace(old_path, new_path)
+            except OSError:
+                os.unlink(new_path)
+                raise
+            self._snapshot[new_filename] = self._snapshot.pop(old_filename, None)
+            self._taken.discard(old_filename.casefold())
+            self._taken.add(new_filename.casefold())
 
         return new_filename
+
+    @staticmethod
+    def _claim(path):
+        """Create an empty placeholder unless the name is already taken.
+
+        Args:
+            path: Path to claim
+
+        Returns:
+            bool: True if the placeholder was created
+
+        Raises:
+            OSError: If the placeholder cannot be created for another reason
+        """
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                return False
+            raise
+        os.close(fd)
+        return True
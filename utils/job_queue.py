@@ -0,0 +1,532 @@
+"""Shared job queue for distributed renaming.
+
+Jobs live in a SQLite database, which can sit on a volume shared by every
+host. Hosts without a shared volume can reach the same queue through
+``JobQueueServer``, a small TCP service in front of the database.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+
+from models.config import JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+APPLIED = "applied"
+
+# Methods RemoteJobQueue may call through JobQueueServer
+REMOTE_METHODS = (
+    "publish",
+    "lease",
+    "renew",
+    "complete",
+    "fail",
+    "release",
+    "abort",
+    "reclaim_expired",
+    "finished",
+    "mark_applied",
+    "reject",
+    "counts",
+    "reassigned",
+)
+
+
+class JobQueue:
+    """SQLite-backed queue of images waiting for a title.
+
+    Workers lease one job at a time. A lease expires unless it is renewed,
+    so jobs held by a worker that died go back to the queue (and count as
+    an attempt) the next time anyone leases or reclaims. Jobs that fail
+    ``max_attempts`` times are marked failed.
+
+    The connection is shared between threads behind a lock, so one queue
+    object can serve every handler of a ``JobQueueServer``. The database
+    uses the default rollback journal because WAL does not work on
+    network filesystems.
+    """
+
+    def __init__(self, path, max_attempts=JOB_MAX_ATTEMPTS):
+        """Open (or create) the queue database.
+
+        Args:
+            path: Path of the SQLite database
+            max_attempts: Leases a job gets before it is marked failed
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                batch TEXT NOT NULL,
+                path TEXT NOT NULL,
+                model TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                reassignments INTEGER NOT NULL DEFAULT 0,
+                title TEXT,
+                error TEXT
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch, status)"
+        )
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self):
+        """Use the queue as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        """Close the queue when leaving the context."""
+        self.close()
+
+    def _write(self, callback):
+        """Run writes in one immediate transaction.
+
+        ``BEGIN IMMEDIATE`` takes the database write lock up front, so two
+        hosts can never lease the same job.
+
+        Args:
+            callback: Function taking the connection; its result is returned
+
+        Returns:
+            The callback's result
+        """
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = callback(self.connection)
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+            return result
+
+    def publish(self, batch, model, paths):
+        """Add jobs for a batch of images.
+
+        Args:
+            batch: Identifier shared by the batch's jobs
+            model: Model combobox label workers should use
+            paths: Image paths as seen by the coordinator
+
+        Returns:
+            int: Number of jobs added
+        """
+        rows = [(batch, path, model) for path in paths]
+        self._write(
+            lambda db: db.executemany(
+                "INSERT INTO jobs (batch, path, model) VALUES (?, ?, ?)", rows
+            )
+        )
+        return len(rows)
+
+    def _reclaim(self, db, now):
+        """Return expired leases to the queue (inside a transaction).
+
+        Args:
+            db: The connection, inside a write transaction
+            now: Current time
+
+        Returns:
+            int: Number of jobs reassigned
+        """
+        db.execute(
+            """
+            UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL,
+                error = 'Lease expired'
+            WHERE status = ? AND lease_expires < ? AND attempts >= ?
+            """,
+            (FAILED, LEASED, now, self.max_attempts),
+        )
+        return db.execute(
+            """
+            UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL,
+                reassignments = reassignments + 1
+            WHERE status = ? AND lease_expires < ?
+            """,
+            (PENDING, LEASED, now),
+        ).rowcount
+
+    def reclaim_expired(self):
+        """Return jobs with expired leases to the queue.
+
+        Returns:
+            int: Number of jobs reassigned
+        """
+        return self._write(lambda db: self._reclaim(db, time.time()))
+
+    def lease(self, worker, lease_seconds=JOB_LEASE_SECONDS):
+        """Take the oldest pending job.
+
+        Args:
+            worker: Identifier of the leasing worker
+            lease_seconds: Seconds before the lease expires unless renewed
+
+        Returns:
+            dict | None: Job with id, batch, path and model, or None if idle
+        """
+
+        def take(db):
+            now = time.time()
+            self._reclaim(db, now)
+            row = db.execute(
+                "SELECT id, batch, path, model FROM jobs "
+                "WHERE status = ? ORDER BY id LIMIT 1",
+                (PENDING,),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                """
+                UPDATE jobs SET status = ?, worker = ?, lease_expires = ?,
+                    attempts = attempts + 1
+                WHERE id = ?
+                """,
+                (LEASED, worker, now + lease_seconds, row["id"]),
+            )
+            return dict(row)
+
+        return self._write(take)
+
+    def renew(self, job_id, worker, lease_seconds=JOB_LEASE_SECONDS):
+        """Extend a lease.
+
+        Args:
+            job_id: The leased job
+            worker: Identifier of the leasing worker
+            lease_seconds: Seconds from now before the lease expires
+
+        Returns:
+            bool: False if the worker no longer holds the lease
+        """
+        return bool(
+            self._write(
+                lambda db: db.execute(
+                    "UPDATE jobs SET lease_expires = ? "
+                    "WHERE id = ? AND worker = ? AND status = ?",
+                    (time.time() + lease_seconds, job_id, worker, LEASED),
+                ).rowcount
+            )
+        )
+
+    def complete(self, job_id, worker, title):
+        """Report a generated title.
+
+        A late result is still accepted if the job went back to the queue
+        and nobody has leased it again.
+
+        Args:
+            job_id: The leased job
+            worker: Identifier of the reporting worker
+            title: The generated title
+
+        Returns:
+            bool: False if another worker now holds the job
+        """
+        return bool(
+            self._write(
+                lambda db: db.execute(
+                    """
+                    UPDATE jobs SET status = ?, worker = ?, title = ?,
+                        lease_expires = NULL, error = NULL
+                    WHERE id = ?
+                        AND ((status = ? AND worker = ?) OR status = ?)
+                    """,
+                    (DONE, worker, title, job_id, LEASED, worker, PENDING),
+                ).rowcount
+            )
+        )
+
+    def fail(self, job_id, worker, error, retry=True):
+        """Report a failed attempt.
+
+        Args:
+            job_id: The leased job
+            worker: Identifier of the reporting worker
+            error: Error message
+            retry: Requeue the job unless it has used all its attempts
+        """
+
+        def record(db):
+            row = db.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = ?",
+                (job_id, worker, LEASED),
+            ).fetchone()
+            if row is None:
+                return
+            requeue = retry and row["attempts"] < self.max_attempts
+            db.execute(
+                """
+                UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL,
+                    error = ?
+                WHERE id = ?
+                """,
+                (PENDING if requeue else FAILED, error, job_id),
+            )
+
+        self._write(record)
+
+    def release(self, job_id, worker):
+        """Give a leased job back without counting the attempt.
+
+        Args:
+            job_id: The leased job
+            worker: Identifier of the leasing worker
+        """
+        self._write(
+            lambda db: db.execute(
+                """
+                UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL,
+                    attempts = attempts - 1
+                WHERE id = ? AND worker = ? AND status = ?
+                """,
+                (PENDING, job_id, worker, LEASED),
+            )
+        )
+
+    def abort(self, batch, error):
+        """Fail every unfinished job in a batch.
+
+        Args:
+            batch: The batch to abort
+            error: Error message recorded on the jobs
+
+        Returns:
+            int: Number of jobs aborted
+        """
+        return self._write(
+            lambda db: db.execute(
+                """
+                UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL,
+                    error = ?
+                WHERE batch = ? AND status IN (?, ?)
+                """,
+                (FAILED, error, batch, PENDING, LEASED),
+            ).rowcount
+        )
+
+    def finished(self, batch):
+        """Get jobs in a batch whose titles have not been applied yet.
+
+        Args:
+            batch: The batch to check
+
+        Returns:
+            list[dict]: Jobs with id, path, worker and title
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT id, path, worker, title FROM jobs "
+                "WHERE batch = ? AND status = ? ORDER BY id",
+                (batch, DONE),
+            )
+            return [dict(row) for row in rows]
+
+    def mark_applied(self, job_ids):
+        """Record that titles were applied (or could not be).
+
+        Args:
+            job_ids: Jobs handled by the coordinator
+        """
+        rows = [(APPLIED, job_id) for job_id in job_ids]
+        self._write(
+            lambda db: db.executemany("UPDATE jobs SET status = ? WHERE id = ?", rows)
+        )
+
+    def reject(self, job_id, error):
+        """Fail a finished job whose title the coordinator will not apply.
+
+        Args:
+            job_id: The finished job
+            error: Error message
+        """
+        self._write(
+            lambda db: db.execute(
+                "UPDATE jobs SET status = ?, error = ? WHERE id = ? AND status = ?",
+                (FAILED, error, job_id, DONE),
+            )
+        )
+
+    def counts(self, batch=None):
+        """Count jobs by status.
+
+        Args:
+            batch: The batch to count, or None for every batch
+
+        Returns:
+            dict: Mapping of status to number of jobs
+        """
+        with self._lock:
+            if batch is None:
+                rows = self.connection.execute(
+                    "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+                )
+            else:
+                rows = self.connection.execute(
+                    "SELECT status, COUNT(*) FROM jobs "
+                    "WHERE batch = ? GROUP BY status",
+                    (batch,),
+                )
+            return {status: count for status, count in rows}
+
+    def reassigned(self, batch):
+        """Count how often a batch's jobs were taken from expired leases.
+
+        Args:
+            batch: The batch to check
+
+        Returns:
+            int: Number of reassignments
+        """
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT COALESCE(SUM(reassignments), 0) FROM jobs WHERE batch = ?",
+                (batch,),
+            ).fetchone()
+            return row[0]
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answers JSON-line calls against the server's JobQueue."""
+
+    def handle(self):
+        """Serve calls until the client disconnects."""
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                method = request["method"]
+                if method not in REMOTE_METHODS:
+                    raise ValueError(f"Unknown method '{method}'")
+                result = getattr(self.server.queue, method)(
+                    *request["args"], **request.get("kwargs", {})
+                )
+                response = {"result": result}
+            except Exception as e:
+                response = {"error": str(e)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class JobQueueServer(socketserver.ThreadingTCPServer):
+    """Exposes a JobQueue to workers over TCP.
+
+    The protocol is one JSON object per line in each direction. There is
+    no authentication, so only bind it to a trusted network.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, queue, address):
+        """Start listening.
+
+        Args:
+            queue: The JobQueue to serve
+            address: (host, port) to bind
+        """
+        super().__init__(address, _RequestHandler)
+        self.queue = queue
+
+
+class RemoteJobQueue:
+    """Client for a JobQueueServer with the same methods as JobQueue."""
+
+    def __init__(self, host, port):
+        """Connect to a queue server.
+
+        Args:
+            host: Server host name
+            port: Server port
+
+        Raises:
+            OSError: If the server cannot be reached
+        """
+        self._lock = threading.Lock()
+        self._socket = socket.create_connection((host, port))
+        self._file = self._socket.makefile("rwb")
+
+    def _call(self, method, *args, **kwargs):
+        """Call a queue method on the server.
+
+        Args:
+            method: Name of the JobQueue method
+            *args: JSON-serializable arguments
+            **kwargs: JSON-serializable keyword arguments
+
+        Returns:
+            The method's result
+
+        Raises:
+            RuntimeError: If the call failed on the server
+            ConnectionError: If the server closed the connection
+        """
+        request = {"method": method, "args": args, "kwargs": kwargs}
+        request = json.dumps(request).encode("utf-8")
+        with self._lock:
+            self._file.write(request + b"\n")
+            self._file.flush()
+            line = self._file.readline()
+        if not line:
+            raise ConnectionError("Job queue server closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(f"Job queue {method} failed: {response['error']}")
+        return response["result"]
+
+    def __getattr__(self, name):
+        """Forward JobQueue methods to the server."""
+        if name in REMOTE_METHODS:
+            return lambda *args, **kwargs: self._call(name, *args, **kwargs)
+        raise AttributeError(name)
+
+    def close(self):
+        """Close the connection."""
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        """Use the client as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        """Close the connection when leaving the context."""
+        self.close()
+
+
+def open_job_queue(location):
+    """Open a queue from a database path or a ``tcp://host:port`` address.
+
+    Args:
+        location: SQLite path, or address of a JobQueueServer
+
+    Returns:
+        JobQueue | RemoteJobQueue: The queue
+    """
+    if location.startswith("tcp://"):
+        host, _, port = location[len("tcp://") :].rpartition(":")
+        return RemoteJobQueue(host, int(port))
+    return JobQueue(location)
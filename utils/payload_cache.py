@@ -0,0 +1,215 @@
+"""Two-tier cache of preprocessed inference payloads."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from models.config import (
+    PAYLOAD_CACHE_DIR,
+    PAYLOAD_CACHE_MEMORY_MB,
+    PAYLOAD_CACHE_DISK_MB,
+)
+
+# Fraction of the disk limit kept after an eviction pass, so passes are rare
+DISK_EVICTION_TARGET = 0.9
+
+
+class PayloadCache:
+    """Keeps encoded image payloads so re-runs skip reading and decoding.
+
+    Payloads are held in an in-memory LRU tier and written to an on-disk
+    tier of blob files. Each tier has its own size limit. Disk blobs are
+    touched on every hit, and eviction removes the least recently used
+    ones. Keys are tuples describing the source image and how it was
+    encoded. The caller decides what identifies the source.
+    """
+
+    def __init__(
+        self,
+        cache_dir=PAYLOAD_CACHE_DIR,
+        memory_mb=PAYLOAD_CACHE_MEMORY_MB,
+        disk_mb=PAYLOAD_CACHE_DISK_MB,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the on-disk tier
+            memory_mb: Size limit of the in-memory tier
+            disk_mb: Size limit of the on-disk tier; 0 disables it
+        """
+        self.cache_dir = cache_dir
+        self.memory_limit = memory_mb * 1024 * 1024
+        self.disk_limit = disk_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._disk_size = None  # Measured on first write
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    def _blob_path(self, key):
+        """Get the on-disk path for a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            str: Path of the blob file
+        """
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.bin")
+
+    def _remember(self, key, payload):
+        """Add a payload to the memory tier, evicting old entries.
+
+        Must be called with the lock held.
+
+        Args:
+            key: Cache key
+            payload: Encoded payload bytes
+        """
+        if len(payload) > self.memory_limit:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[key] = payload
+        self._memory_size += len(payload)
+        while self._memory_size > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def get(self, key):
+        """Look up a payload.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bytes | None: The payload, or None on a miss
+        """
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return payload
+
+        if self.disk_limit:
+            path = self._blob_path(key)
+            try:
+                with open(path, "rb") as blob_file:
+                    payload = blob_file.read()
+                os.utime(path)
+            except OSError:
+                payload = None
+            if payload is not None:
+                with self._lock:
+                    self._remember(key, payload)
+                    self.hits["disk"] += 1
+                return payload
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, payload):
+        """Store a payload in both tiers.
+
+        Args:
+            key: Cache key
+            payload: Encoded payload bytes
+        """
+        with self._lock:
+            self._remember(key, payload)
+
+        if not self.disk_limit or len(payload) > self.disk_limit:
+            return
+
+        path = self._blob_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as blob_file:
+                blob_file.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write payload cache: {str(e)}")
+            return
+
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = sum(size for _, _, size in self._scan_disk())
+            else:
+                self._disk_size += len(payload)
+            if self._disk_size > self.disk_limit:
+                self._evict_disk()
+
+    def get_or_create(self, key, create):
+        """Look up a payload, creating and storing it on a miss.
+
+        Args:
+            key: Cache key
+            create: Callable returning the payload bytes
+
+        Returns:
+            bytes: The payload
+        """
+        payload = self.get(key)
+        if payload is None:
+            payload = create()
+            self.put(key, payload)
+        return payload
+
+    def _scan_disk(self):
+        """List blobs in the on-disk tier.
+
+        Returns:
+            list[tuple]: (path, last_used, size) for every blob
+        """
+        blobs = []
+        try:
+            folders = list(os.scandir(self.cache_dir))
+        except OSError:
+            return blobs
+        for folder in folders:
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                if entry.name.endswith(".bin"):
+                    stat = entry.stat()
+                    blobs.append((entry.path, stat.st_mtime, stat.st_size))
+        return blobs
+
+    def _evict_disk(self):
+        """Delete least recently used blobs until under the disk target.
+
+        Must be called with the lock held.
+        """
+        blobs = sorted(self._scan_disk(), key=lambda blob: blob[1])
+        size = sum(blob_size for _, _, blob_size in blobs)
+        target = self.disk_limit * DISK_EVICTION_TARGET
+        for path, _, blob_size in blobs:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+                size -= blob_size
+            except OSError:
+                pass
+        self._disk_size = size
+
+    def stats(self):
+        """Get hit counts and tier sizes.
+
+        Returns:
+            dict: Hits per tier, misses and memory tier size in bytes
+        """
+        with self._lock:
+            return {
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "memory_bytes": self._memory_size,
+            }
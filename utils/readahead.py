@@ -0,0 +1,94 @@
+"""Bounded read-ahead of image files for slow (network) filesystems."""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from models.config import READAHEAD_WORKERS, READAHEAD_DEPTH
+
+
+def read_file(filepath):
+    """Read a whole file, hinting sequential access where supported.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        bytes: The file contents
+    """
+    with open(filepath, "rb") as image_file:
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(
+                    image_file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL
+                )
+            except OSError:
+                # Not supported by every filesystem (e.g. some FUSE mounts)
+                pass
+        return image_file.read()
+
+
+class ReadaheadPool:
+    """Reads upcoming files in the background so inference never waits on I/O.
+
+    At most ``depth`` files are held in memory or in flight at once;
+    ``prefetch`` returns False when the pool is full so callers can try
+    again after taking a file.
+    """
+
+    def __init__(self, workers=READAHEAD_WORKERS, depth=READAHEAD_DEPTH):
+        """Initialize the pool.
+
+        Args:
+            workers: Number of concurrent reads
+            depth: Maximum number of files buffered or being read
+        """
+        self.depth = depth
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="readahead"
+        )
+        self._lock = threading.Lock()
+        self._futures = {}
+
+    def prefetch(self, filepath):
+        """Start reading a file in the background.
+
+        Args:
+            filepath: Path to the file
+
+        Returns:
+            bool: True if the file is queued (or already was), False if full
+        """
+        with self._lock:
+            if filepath in self._futures:
+                return True
+            if len(self._futures) >= self.depth:
+                return False
+            self._futures[filepath] = self._executor.submit(read_file, filepath)
+            return True
+
+    def take(self, filepath):
+        """Get a file's contents, reading it now if it was not prefetched.
+
+        Args:
+            filepath: Path to the file
+
+        Returns:
+            bytes: The file contents
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        with self._lock:
+            future = self._futures.pop(filepath, None)
+        if future is None:
+            return read_file(filepath)
+        return future.result()
+
+    def close(self):
+        """Drop buffered files and stop reading."""
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+            self._futures.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,202 @@
+"""Incremental search index over image filenames and AI titles."""
+
+import bisect
+import sys
+import threading
+from array import array
+from itertools import islice
+
+
+def _trigrams(text):
+    """Get the set of 3-character substrings of a string.
+
+    Args:
+        text: Lowercased text to split
+
+    Returns:
+        set[str]: Trigrams in the text
+    """
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Finds images whose filename or AI title contains a query.
+
+    Entries are identified by their position in the image list, which is
+    already in natural-sort order, so results only need sorting by id.
+    Queries of three or more characters use a trigram index; shorter ones
+    use a sorted filename list for prefix matches. Both are updated in
+    place when an image is renamed; renames made while the index is being
+    built are queued and applied once it is ready.
+
+    Posting lists are compact integer arrays kept in id order, so a
+    limited search can stop after the first matches. They are never shrunk
+    on rename. Stale entries are dropped when candidates are verified
+    against the current text, which keeps updates cheap.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._lock = threading.Lock()
+        self._names = []
+        self._texts = []
+        self._postings = {}
+        self._prefixes = []  # Sorted (lowercase filename, id) pairs
+        self._pending = []  # Updates received before the build finished
+        self.ready = False
+
+    @staticmethod
+    def _make_text(filename, title=None):
+        """Build the searchable text for an entry.
+
+        Args:
+            filename: The image filename
+            title: Optional AI-generated title from the catalog
+
+        Returns:
+            str: Lowercased searchable text
+        """
+        if title:
+            return f"{filename} {title}".lower()
+        return filename.lower()
+
+    def _add_postings(self, image_id, trigrams):
+        """Insert an id into the posting list of each trigram, keeping order.
+
+        Args:
+            image_id: The entry id
+            trigrams: Trigrams to add the id to
+        """
+        for trigram in trigrams:
+            postings = self._postings.get(trigram)
+            if postings is None:
+                postings = self._postings[trigram] = array("I")
+            position = bisect.bisect_left(postings, image_id)
+            if position == len(postings) or postings[position] != image_id:
+                postings.insert(position, image_id)
+
+    def build(self, filenames, titles=None):
+        """Rebuild the index for a new image list.
+
+        Args:
+            filenames: Filenames in natural-sort order
+            titles: Optional mapping of filename to AI title
+        """
+        titles = titles or {}
+        texts = []
+        postings = {}
+        for image_id, filename in enumerate(filenames):
+            text = self._make_text(filename, titles.get(filename))
+            texts.append(text)
+            for trigram in _trigrams(text):
+                entry = postings.get(trigram)
+                if entry is None:
+                    entry = postings[trigram] = array("I")
+                entry.append(image_id)
+        prefixes = sorted((name.lower(), i) for i, name in enumerate(filenames))
+
+        with self._lock:
+            self._names = list(filenames)
+            self._texts = texts
+            self._postings = postings
+            self._prefixes = prefixes
+            self.ready = True
+            for update in self._pending:
+                self._apply_update(*update)
+            self._pending = []
+
+    def update(self, image_id, new_filename, title=None):
+        """Update an entry after a rename.
+
+        Args:
+            image_id: The entry id (position in the image list)
+            new_filename: The filename after the rename
+            title: Optional AI title for the entry
+        """
+        with self._lock:
+            if not self.ready:
+                self._pending.append((image_id, new_filename, title))
+                return
+            self._apply_update(image_id, new_filename, title)
+
+    def _apply_update(self, image_id, new_filename, title):
+        """Update an entry after a rename.
+
+        Must be called with the lock held.
+
+        Args:
+            image_id: The entry id (position in the image list)
+            new_filename: The filename after the rename
+            title: Optional AI title for the entry
+        """
+        if image_id >= len(self._texts):
+            return
+
+        old_filename = self._names[image_id]
+        self._names[image_id] = new_filename
+        old_text = self._texts[image_id]
+        new_text = self._make_text(new_filename, title)
+        self._texts[image_id] = new_text
+        self._add_postings(image_id, _trigrams(new_text) - _trigrams(old_text))
+
+        old_key = (old_filename.lower(), image_id)
+        position = bisect.bisect_left(self._prefixes, old_key)
+        if position < len(self._prefixes) and self._prefixes[position] == old_key:
+            del self._prefixes[position]
+        bisect.insort(self._prefixes, (new_filename.lower(), image_id))
+
+    def search(self, query, limit=None):
+        """Find entries matching a query.
+
+        Args:
+            query: Text to look for (case-insensitive)
+            limit: Return at most this many ids (the first in natural-sort
+                order), or None for all
+
+        Returns:
+            list[int]: Matching ids in natural-sort order
+        """
+        query = query.strip().lower()
+        with self._lock:
+            texts = self._texts
+            if not query:
+                count = len(texts) if limit is None else min(limit, len(texts))
+                return list(range(count))
+
+            if len(query) < 3:
+                prefixes = self._prefixes
+                start = bisect.bisect_left(prefixes, (query,))
+                end = bisect.bisect_left(prefixes, (query + chr(sys.maxunicode),))
+
+                # When matches are dense the first ``limit`` of them are
+                # found quickly by walking ids in order. The walk is capped
+                # at about the cost of sorting every match (a text check
+                # costs roughly three sort steps), then falls back to that.
+                if limit is not None and end - start > limit:
+                    matches = []
+                    budget = (end - start) // 3
+                    for image_id, text in enumerate(islice(texts, budget)):
+                        if text.startswith(query):
+                            matches.append(image_id)
+                            if len(matches) == limit:
+                                return matches
+
+                matches = sorted(image_id for _, image_id in prefixes[start:end])
+                return matches[:limit]
+
+            # Verify candidates from the rarest trigram against current text
+            smallest = None
+            for trigram in _trigrams(query):
+                postings = self._postings.get(trigram)
+                if postings is None:
+                    return []
+                if smallest is None or len(postings) < len(smallest):
+                    smallest = postings
+
+            matches = []
+            for image_id in smallest:
+                if query in texts[image_id]:
+                    matches.append(image_id)
+                    if len(matches) == limit:
+                        break
+            return matches